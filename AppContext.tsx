@@ -1,6 +1,8 @@
 import React, { createContext, useState, useContext, useEffect, ReactNode } from 'react';
-import axios from './api';
-import isAxiosError from './api';
+import { isAxiosError } from 'axios';
+// The shared instance sends cookies cross-origin, so the browser keeps the
+// HttpOnly refresh cookie set by /auth/login and returns it to /auth/*
+import API from './api';
 import { WorkerProfile, EmployerProfile, User, UserRole } from '../types/models';
 
 interface AppContextType {
@@ -43,10 +45,10 @@ export const AppProvider: React.FC<AppProviderProps> = ({ children }) => {
 
     try {
       const [workerRes, employerRes] = await Promise.all([
-        axios.get('/users/worker/profile', {
+        API.get('/users/worker/profile', {
           headers: { Authorization: `Bearer ${token}` }
         }),
-        axios.get('/users/employer/profile', {
+        API.get('/users/employer/profile', {
           headers: { Authorization: `Bearer ${token}` }
         })
       ]);
@@ -85,7 +87,7 @@ export const AppProvider: React.FC<AppProviderProps> = ({ children }) => {
   const registerUser = async (name: string, email: string, password: string) => {
     try {
       const formData = { name, email, password };
-      const response = await axios.post("http://localhost:5000/auth/register", formData);
+      const response = await API.post("/auth/register", formData);
       localStorage.setItem("token", response.data.access_token);
       setCurrentUser(response.data.user);
     } catch (error) {
@@ -102,7 +104,7 @@ export const AppProvider: React.FC<AppProviderProps> = ({ children }) => {
 
   const login = async (email: string, password: string) => {
     try {
-      const response = await axios.post("/auth/login", {
+      const response = await API.post("/auth/login", {
         email,
         password
       
@@ -113,9 +115,9 @@ export const AppProvider: React.FC<AppProviderProps> = ({ children }) => {
       const { access_token, user } = response.data;
       
       
-      // Set token in localStorage and axios defaults
+      // Set token in localStorage and API defaults
       localStorage.setItem("token", access_token);
-      axios.defaults.headers.common['Authorization'] = `Bearer ${access_token}`;
+      API.defaults.headers.common['Authorization'] = `Bearer ${access_token}`;
       
       // Update current user
       setCurrentUser(user);
@@ -127,18 +129,20 @@ export const AppProvider: React.FC<AppProviderProps> = ({ children }) => {
   };
 
   const logout = () => {
+    // Revoke the refresh token too; the session ends even if this call fails
+    API.post('/auth/logout').catch(() => undefined);
     setCurrentUser(null);
     localStorage.removeItem('token');
-    axios.defaults.headers.common['Authorization'] = '';
+    API.defaults.headers.common['Authorization'] = '';
   };
 
   // Check for existing token on mount
   useEffect(() => {
     const token = localStorage.getItem('token');
     if (token) {
-      axios.defaults.headers.common['Authorization'] = `Bearer ${token}`;
+      API.defaults.headers.common['Authorization'] = `Bearer ${token}`;
       // Fetch user profile
-      axios.get('/users/me')
+      API.get('/users/me')
         .then(response => {
           setCurrentUser(response.data.user);
         })
@@ -13,22 +13,21 @@ const EmployerDashboard = () => {
 
   const fetchData = async () => {
     try {
-      const [
-        appliedJobsRes,
-        recommendedRes,
-        employerProfileRes,
-        allWorkersRes,
-      ] = await Promise.all([
-        axios.get('/application/applied'),
-        axios.get('/recommendation/workers'),
-        axios.get('/users/employer/profile'),
+      const [dashboardRes, allWorkersRes] = await Promise.all([
+        axios.get('/dashboard/employer'),
         axios.get('/profiles/workers'),
       ]);
 
-      setAppliedJobs(appliedJobsRes.data.jobs || []);
-      setRecommendedWorkers(recommendedRes.data.recommended_workers || []);
-      setProfile(employerProfileRes.data.profile || null);
-      setAllWorkers(allWorkersRes.data.workers || []);
+      const { profile: employer, jobs, recommended_workers } = dashboardRes.data;
+      setAppliedJobs(jobs || []);
+      setRecommendedWorkers(recommended_workers || []);
+      setProfile(employer ? {
+        ...employer,
+        companyName: employer.company_name,
+        phone: employer.contact_number,
+        location: { city: employer.address?.city, state: employer.address?.state },
+      } : null);
+      setAllWorkers(allWorkersRes.data || []);
     } catch (error) {
       console.error('Dashboard fetch error:', error);
     } finally {
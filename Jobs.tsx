@@ -1,19 +1,37 @@
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 import { AppLayout } from "@/components/AppLayout";
 import { JobCard } from "@/components/JobCard";
+import { Button } from "@/components/ui/button";
 import { JobPosting } from "@/types/models";
-import API from "@/contexts/api";
+import API, { subscribeToJobs } from "@/contexts/api";
+
+const PAGE_SIZE = 30;
+
+type JobsPage = {
+  jobs: JobPosting[];
+  next_cursor: string | null;
+};
 
 const Jobs = () => {
   const [jobs, setJobs] = useState<JobPosting[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
+  const fetchPage = useCallback(async (cursor?: string) => {
+    const response = await API.get<JobsPage>('/jobs/', {
+      params: { limit: PAGE_SIZE, open: true, cursor }
+    });
+    return response.data;
+  }, []);
+
   useEffect(() => {
     const fetchJobs = async () => {
       try {
-        const response = await API.get('/jobs/recommendations');
-        setJobs(response.data);
+        const page = await fetchPage();
+        setJobs(page.jobs);
+        setNextCursor(page.next_cursor);
       } catch (error) {
         console.error('Error fetching jobs:', error);
         setError('Failed to load jobs');
@@ -23,7 +41,27 @@ const Jobs = () => {
     };
 
     fetchJobs();
-  }, []);
+  }, [fetchPage]);
+
+  // Every new posting is pushed to the top of the board instead of re-polling
+  useEffect(() => subscribeToJobs((job) => {
+    setJobs((current) => current.some((existing) => existing.id === job.id) ? current : [job, ...current]);
+  }, { all: 'true' }), []);
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      setJobs((current) => [...current, ...page.jobs]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Error fetching more jobs:', error);
+      setError('Failed to load jobs');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const filteredJobs = jobs;
 
@@ -37,13 +75,20 @@ const Jobs = () => {
         ) : (
           <>
             <h1 className="text-3xl font-bold mb-8">
-              Available Jobs ({filteredJobs.length})
+              Available Jobs ({filteredJobs.length}{nextCursor ? '+' : ''})
             </h1>
             <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
               {filteredJobs.map((job) => (
                 <JobCard key={job.id} job={job} />
               ))}
             </div>
+            {nextCursor && (
+              <div className="mt-8 flex justify-center">
+                <Button onClick={loadMore} disabled={loadingMore}>
+                  {loadingMore ? 'Loading...' : 'Load more jobs'}
+                </Button>
+              </div>
+            )}
           </>
         )}
       </div>
@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
+import API from '@/contexts/api';
 
 const validatePassword = (password: string): string | null => {
   if (password.length < 6) {
@@ -44,7 +45,7 @@ const Register: React.FC = () => {
 
     setIsSubmitting(true);
     try {
-      const response = await axios.post('http://localhost:5000/auth/register', {
+      const response = await API.post('/auth/register', {
         name,
         email,
         password,
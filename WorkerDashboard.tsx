@@ -2,7 +2,7 @@ import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { WorkerProfile, JobPosting } from '../types/models';
 import { AppLayout } from '@/components/AppLayout';
-import API from '@/contexts/api';
+import API, { subscribeToJobs } from '@/contexts/api';
 import { Card, CardContent } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
 import { JobCard } from '@/components/JobCard';
@@ -16,13 +16,11 @@ const WorkerDashboard: React.FC = () => {
 
   const fetchData = async () => {
     try {
-      const [profileRes, jobsRes] = await Promise.all([
-        API.get('/users/worker/profile'),
-        API.get('/jobs/recommendations')
-      ]);
+      // Profile and recommendations in a single round trip
+      const { data } = await API.get('/dashboard/worker');
 
-      setProfile(profileRes.data);
-      setRecommendedJobs(jobsRes.data || []);
+      setProfile(data.profile);
+      setRecommendedJobs(data.recommended_jobs || []);
     } catch (error: any) {
       console.error('Dashboard fetch error:', error);
       if (error.response?.status === 401) {
@@ -39,6 +37,11 @@ const WorkerDashboard: React.FC = () => {
     fetchData();
   }, []);
 
+  // New postings matching the worker's skills arrive as they are posted
+  useEffect(() => subscribeToJobs((job) => {
+    setRecommendedJobs((current) => current.some((existing) => existing.id === job.id) ? current : [job, ...current]);
+  }), []);
+
   if (loading) {
     return (
       <AppLayout>
@@ -1,6 +1,7 @@
 import axios from 'axios';
 import { jwtDecode } from "jwt-decode";
 import { clearAuth } from '../utils/logout';
+import { JobPosting } from '../types/models';
 
 const API = axios.create({
   baseURL: import.meta.env.VITE_API_URL || 'http://localhost:5000',
@@ -9,29 +10,68 @@ const API = axios.create({
     'Content-Type': 'application/json',
     'Accept': 'application/json'
   },
-  withCredentials: true // This must match backend CORS config
+  withCredentials: true // This must match backend CORS config (also sends the refresh cookie)
 });
 
+// Renew this long before the access token expires, to absorb clock skew
+const EXPIRY_MARGIN_MS = 30 * 1000;
+
+// Matches the retry delay the server sends on the job stream
+const STREAM_RETRY_MS = 5000;
+
+// Unreadable tokens count as expired, so they get replaced too
+const isExpiring = (token: string): boolean => {
+  try {
+    const { exp } = jwtDecode(token) as { exp: number };
+    return exp * 1000 - EXPIRY_MARGIN_MS < Date.now();
+  } catch {
+    return true;
+  }
+};
+
+// One refresh at a time: concurrent requests wait for the same new token.
+// The refresh token is an HttpOnly cookie scoped to /auth, rotated by the server.
+let refreshing: Promise<string> | null = null;
+
+export const refreshAccessToken = (): Promise<string> => {
+  if (!refreshing) {
+    refreshing = axios
+      .post(`${API.defaults.baseURL}/auth/refresh`, {}, { withCredentials: true })
+      .then((response) => {
+        const token: string = response.data.access_token;
+        localStorage.setItem('token', token);
+        return token;
+      })
+      .catch((error) => {
+        clearAuth();
+        throw error;
+      })
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+};
+
+const isAuthRequest = (url?: string) => !!url && url.includes('/auth/');
+
 // Request Interceptor
 API.interceptors.request.use(
-  (config) => {
-    const token = localStorage.getItem('token');
-    if (token) {
+  async (config) => {
+    let token = localStorage.getItem('token');
+    if (token && !isAuthRequest(config.url)) {
       try {
-        const decodedToken = jwtDecode(token);
-        const isExpired = (decodedToken as { exp: number }).exp * 1000 < Date.now();
-        if (isExpired) {
-          console.warn('Token expired');
-          clearAuth();
-          return Promise.reject('Token expired');
+        if (isExpiring(token)) {
+          token = await refreshAccessToken();
         }
-
-        config.headers.Authorization = `Bearer ${token}`;
       } catch (error) {
-        console.error('Invalid token format:', error);
-        clearAuth();
+        console.warn('Session expired');
+        return Promise.reject(error);
       }
     }
+    if (token) {
+      config.headers.Authorization = `Bearer ${token}`;
+    }
     return config;
   },
   (error) => {
@@ -39,18 +79,72 @@ API.interceptors.request.use(
   }
 );
 
-// Response Interceptor
+// Response Interceptor: on a 401, refresh once and replay the request
 API.interceptors.response.use(
   (response) => response,
-  (error) => {
-    if (error.response) {
-      const status = error.response.status;
-      if (status === 401) {
-        clearAuth();
+  async (error) => {
+    const original = error.config;
+    if (error.response?.status === 401 && original && !original._retried && !isAuthRequest(original.url)) {
+      original._retried = true;
+      try {
+        const token = await refreshAccessToken();
+        original.headers.Authorization = `Bearer ${token}`;
+        return API(original);
+      } catch {
+        return Promise.reject(error);
       }
     }
     return Promise.reject(error);
   }
 );
 
+// Live feed of newly posted jobs over server-sent events. EventSource can't
+// send headers, so it connects with a short-lived stream ticket rather than
+// the access token (query strings end up in access logs). The browser
+// reconnects by itself and the server resumes from the last event id.
+export const subscribeToJobs = (
+  onJob: (job: JobPosting) => void,
+  params: Record<string, string> = {}
+): (() => void) => {
+  let source: EventSource | null = null;
+  let closed = false;
+  let lastEventId = '';
+
+  const retry = () => setTimeout(() => !closed && open(), STREAM_RETRY_MS);
+
+  const open = () => {
+    API.post('/jobs/stream/ticket')
+      .then(({ data }) => {
+        if (closed) {
+          return;
+        }
+        const query = new URLSearchParams({
+          ...params,
+          ticket: data.ticket,
+          ...(lastEventId ? { last_event_id: lastEventId } : {})
+        });
+        source = new EventSource(`${API.defaults.baseURL}/jobs/stream?${query}`, { withCredentials: true });
+        source.addEventListener('job', (event) => {
+          lastEventId = (event as MessageEvent).lastEventId;
+          onJob(JSON.parse((event as MessageEvent).data));
+        });
+        // A rejected response (expired ticket, server at capacity) closes the
+        // stream for good; reopen it after a pause with a new ticket
+        source.onerror = () => {
+          if (source?.readyState === EventSource.CLOSED && !closed) {
+            retry();
+          }
+        };
+      })
+      // Logged out: stop; anything else (network, 429): try again later
+      .catch(() => localStorage.getItem('token') && retry());
+  };
+
+  open();
+  return () => {
+    closed = true;
+    source?.close();
+  };
+};
+
 export default API;
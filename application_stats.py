@@ -0,0 +1,113 @@
+from sqlalchemy import func, case, select, literal
+from sqlalchemy.exc import IntegrityError
+from backend.models import db, Application, Job, JobApplicationStats
+from backend.db_compat import insert_ignore
+
+APPLICATION_STATUSES = ('pending', 'accepted', 'rejected')
+
+
+def _deltas(changes):
+    return {getattr(JobApplicationStats, column): getattr(JobApplicationStats, column) + delta
+            for column, delta in changes.items()}
+
+
+def _increment(job, changes):
+    """Apply {column: delta} to the job's counters inside the current transaction.
+
+    Uses a single UPDATE ... SET col = col + delta so concurrent applies
+    never lose counts; the row is created on first use.
+    """
+    values = _deltas(changes)
+    updated = (
+        JobApplicationStats.query
+        .filter_by(job_id=job.id)
+        .update(values, synchronize_session=False)
+    )
+    if updated:
+        return
+
+    try:
+        with db.session.begin_nested():
+            row = JobApplicationStats(job_id=job.id, employer_id=job.employer_id,
+                                      total=0, pending=0, accepted=0, rejected=0)
+            for column, delta in changes.items():
+                setattr(row, column, delta)
+            db.session.add(row)
+    except IntegrityError:
+        # Another request created the row first; fall back to the update
+        JobApplicationStats.query.filter_by(job_id=job.id).update(values, synchronize_session=False)
+
+
+def record_application(job, status='pending'):
+    _increment(job, {'total': 1, status: 1})
+
+
+def record_applications(job_ids, status='pending'):
+    """record_application for a batch of jobs: two statements however many jobs.
+
+    Missing counter rows are created at zero first (duplicates ignored), so
+    the single UPDATE that follows never races a concurrent first apply.
+    """
+    counters = select(
+        Job.id, Job.employer_id, *[literal(0, db.Integer)] * (1 + len(APPLICATION_STATUSES))
+    ).where(Job.id.in_(job_ids))
+    db.session.execute(insert_ignore(
+        JobApplicationStats, ['job_id', 'employer_id', 'total', *APPLICATION_STATUSES], counters, ['job_id']
+    ))
+    (
+        JobApplicationStats.query
+        .filter(JobApplicationStats.job_id.in_(job_ids))
+        .update(_deltas({'total': 1, status: 1}), synchronize_session=False)
+    )
+
+
+def record_status_change(job, old_status, new_status):
+    if old_status == new_status:
+        return
+    changes = {new_status: 1}
+    if old_status in APPLICATION_STATUSES:
+        changes[old_status] = -1
+    _increment(job, changes)
+
+
+def stats_for_employer(employer_id, job_id=None):
+    query = JobApplicationStats.query.filter_by(employer_id=employer_id)
+    if job_id is not None:
+        query = query.filter_by(job_id=job_id)
+    rows = query.order_by(JobApplicationStats.job_id).all()
+
+    totals = {column: 0 for column in ('total',) + APPLICATION_STATUSES}
+    for row in rows:
+        for column in totals:
+            totals[column] += getattr(row, column)
+    return {
+        "employer": dict(totals, employer_id=employer_id, jobs=len(rows)),
+        "jobs": [row.to_dict() for row in rows]
+    }
+
+
+def reconcile():
+    """Rebuild every counter row from the application table; returns the row count."""
+    status_counts = [
+        func.sum(case((Application.status == status, 1), else_=0)).label(status)
+        for status in APPLICATION_STATUSES
+    ]
+    rows = (
+        db.session.query(Application.job_id, Job.employer_id, func.count(Application.id).label('total'), *status_counts)
+        .join(Job, Application.job_id == Job.id)
+        .group_by(Application.job_id, Job.employer_id)
+        .all()
+    )
+    JobApplicationStats.query.delete(synchronize_session=False)
+    if rows:
+        db.session.execute(JobApplicationStats.__table__.insert(), [
+            {
+                "job_id": row.job_id,
+                "employer_id": row.employer_id,
+                "total": row.total,
+                **{status: int(getattr(row, status) or 0) for status in APPLICATION_STATUSES}
+            }
+            for row in rows
+        ])
+    db.session.commit()
+    return len(rows)
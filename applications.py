@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
-from backend.models import Application, Job, db
+from backend.models import Application, Job, ArchivedApplication, ArchivedJob, Employer, db
+from backend.application_stats import APPLICATION_STATUSES, record_status_change, stats_for_employer
+from backend.job_apply import apply_to_jobs, parse_job_ids
+from backend.rate_limit import rate_limit
+from sqlalchemy.orm import joinedload
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
 
 applications_bp = Blueprint('applications', __name__)
 
@@ -13,43 +16,84 @@ def apply_to_job():
     user_id = get_jwt_identity()
 
     # Validate required fields
-    if 'job_id' not in data:
+    if not data or 'job_id' not in data:
         return jsonify({"error": "Missing required field: job_id"}), 400
+    try:
+        job_id = int(data['job_id'])
+    except (TypeError, ValueError):
+        return jsonify({"error": "job_id must be an integer"}), 400
 
-    # Check if the job exists
-    job = Job.query.get(data['job_id'])
-    if not job:
-        return jsonify({"error": "Job not found"}), 404
+    # A single insert-or-skip; the unique key rejects repeat applications
+    result = apply_to_jobs(user_id, [job_id])
+    db.session.commit()
 
-    # Check if the user has already applied for the job
-    existing_application = Application.query.filter_by(user_id=user_id, job_id=data['job_id']).first()
-    if existing_application:
+    if result.not_found:
+        return jsonify({"error": "Job not found"}), 404
+    if result.already_applied:
         return jsonify({"error": "You have already applied to this job"}), 400
+    return jsonify({"message": "Applied to job successfully!"}), 201
 
-    # Create the application
-    new_application = Application(
-        job_id=data['job_id'],
-        user_id=user_id,
-        applied_on=datetime.utcnow()  # Add the applied date
+# Apply to several jobs at once, in one transaction
+@applications_bp.route('/apply/bulk', methods=['POST'])
+@rate_limit('10/minute')
+@jwt_required()
+def bulk_apply_to_jobs():
+    try:
+        job_ids = parse_job_ids(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    result = apply_to_jobs(get_jwt_identity(), job_ids)
+    db.session.commit()
+    return jsonify(result.to_dict()), 201 if result.applied else 400
+
+# Update an application's status (employer who posted the job only)
+@applications_bp.route('/<int:application_id>/status', methods=['PATCH'])
+@jwt_required()
+def update_application_status(application_id):
+    data = request.get_json() or {}
+    status = data.get('status')
+    if status not in APPLICATION_STATUSES:
+        return jsonify({"error": f"status must be one of: {', '.join(APPLICATION_STATUSES)}"}), 400
+
+    application = (
+        Application.query
+        .options(joinedload(Application.job))
+        .filter_by(id=application_id)
+        .with_for_update()
+        .first()
     )
-    
-    db.session.add(new_application)
+    if not application:
+        return jsonify({"error": "Application not found"}), 404
+    if str(application.job.employer_id) != str(get_jwt_identity()):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    record_status_change(application.job, application.status, status)
+    application.status = status
     db.session.commit()
+    return jsonify(application.to_dict()), 200
 
-    return jsonify({"message": "Applied to job successfully!"}), 201
+# Application funnel counts for the logged-in employer, per job and overall
+@applications_bp.route('/stats', methods=['GET'])
+@jwt_required()
+def get_application_stats():
+    job_id = request.args.get('job_id', type=int)
+    return jsonify(stats_for_employer(get_jwt_identity(), job_id)), 200
 
 # Get applications for a specific job route
 @applications_bp.route('/job/<int:job_id>', methods=['GET'])
 def get_applications_for_job(job_id):
-    # Fetch the applications for the job
+    # Fetch the applications for the job (from the archive once the job has expired)
     applications = Application.query.filter_by(job_id=job_id).all()
-    
+    if not applications:
+        applications = ArchivedApplication.query.filter_by(job_id=job_id).all()
+
     if not applications:
         return jsonify({"error": "No applications found for this job"}), 404
 
     result = [{
         "id": app.id,
-        "user_id": app.user_id,
+        "user_id": app.worker_id,
         "status": app.status,
         "applied_on": app.applied_on.strftime('%Y-%m-%d') if app.applied_on else None
     } for app in applications]
@@ -63,15 +107,31 @@ def get_applications_for_job(job_id):
 def get_user_applications():
     user_id = get_jwt_identity()
 
-    # Fetch the applications for the user
-    applications = Application.query.filter_by(user_id=user_id).all()
-
-    if not applications:
+    # Fetch the applications together with their jobs and employers in one query.
+    # Job.employer_id holds the posting user's id (see post_job), not Employer.id
+    applications = (
+        db.session.query(Application, Job, Employer)
+        .outerjoin(Job, Job.id == Application.job_id)
+        .outerjoin(Employer, Employer.user_id == Job.employer_id)
+        .filter(Application.worker_id == user_id)
+        .all()
+    )
+    # ?include_archived=true adds applications to jobs that have since expired
+    archived = []
+    if request.args.get('include_archived', '').lower() in ('1', 'true', 'yes'):
+        archived = (
+            db.session.query(ArchivedApplication, ArchivedJob, Employer)
+            .outerjoin(ArchivedJob, ArchivedJob.id == ArchivedApplication.job_id)
+            .outerjoin(Employer, Employer.user_id == ArchivedJob.employer_id)
+            .filter(ArchivedApplication.worker_id == user_id)
+            .all()
+        )
+
+    if not applications and not archived:
         return jsonify({"message": "No applications found for this user"}), 404
 
     result = []
-    for app in applications:
-        job = Job.query.get(app.job_id)
+    for app, job, employer in applications:
         if job:
             result.append({
                 "id": app.id,
@@ -79,9 +139,9 @@ def get_user_applications():
                 "status": app.status,
                 "appliedAt": app.applied_on.strftime('%Y-%m-%d') if app.applied_on else None,
                 "jobTitle": job.title,
-                "companyName": job.company_name,
-                "description": job.description,
-                "location": job.location
+                "companyName": employer.company_name if employer else None,
+                "description": employer.description if employer else None,
+                "location": employer.address if employer else None
             })
         else:
             result.append({
@@ -95,4 +155,17 @@ def get_user_applications():
                 "location": None
             })
 
+    for app, job, employer in archived:
+        result.append({
+            "id": app.id,
+            "jobId": app.job_id,
+            "status": app.status,
+            "appliedAt": app.applied_on.strftime('%Y-%m-%d') if app.applied_on else None,
+            "jobTitle": job.title if job else None,
+            "companyName": employer.company_name if employer else None,
+            "description": employer.description if employer else None,
+            "location": employer.address if employer else None,
+            "archived": True
+        })
+
     return jsonify(result)
@@ -1,7 +1,10 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from backend.models import db, User
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token
+from backend.password_hashing import hasher, HasherSaturated
+from backend.user_cache import invalidate_user
+from backend.rate_limit import rate_limit
+from backend.refresh_tokens import issue_tokens, rotate_tokens, revoke_tokens, set_refresh_cookie, ROTATED, GRACE, REUSED
+from flask_jwt_extended import jwt_required, get_jwt, unset_refresh_cookies
 from flask_cors import cross_origin
 import re
 
@@ -14,7 +17,13 @@ def is_valid_email(email):
 def is_strong_password(password):
     return len(password) >= 6 and any(c.isdigit() for c in password) and any(c.isupper() for c in password)
 
+def too_busy():
+    response = jsonify({"error": "Server is busy, please retry shortly"})
+    response.headers['Retry-After'] = '1'
+    return response, 429
+
 @auth_bp.route('/register', methods=['POST', 'OPTIONS'])
+@rate_limit('5/minute', key='ip')
 @cross_origin(supports_credentials=True)
 def register():
     # Handle preflight OPTIONS request
@@ -49,7 +58,7 @@ def register():
         if not is_strong_password(data['password']):
             return jsonify({"error": "Password must be at least 6 characters long, contain an uppercase letter and a number"}), 400
 
-        hashed_password = generate_password_hash(data['password'])
+        hashed_password = hasher.hash(data['password'])
 
         new_user = User(
             name=data['name'],
@@ -63,20 +72,27 @@ def register():
         db.session.add(new_user)
         db.session.commit()
 
-        token = create_access_token(identity=new_user.id)
+        token, refresh_token = issue_tokens(new_user.id)
 
-        return jsonify({
+        response = jsonify({
             "message": "Registered successfully",
             "access_token": token,
             "user": new_user.to_dict()
-        }), 201
+        })
+        if refresh_token:
+            set_refresh_cookie(response, refresh_token)
+        return response, 201
 
+    except HasherSaturated:
+        db.session.rollback()
+        return too_busy()
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"An error occurred while registering the user: {str(e)}"}), 500
 
 
 @auth_bp.route('/login', methods=['POST', 'OPTIONS'])
+@rate_limit('10/minute', key='ip')
 @cross_origin(supports_credentials=True)
 def login():
     if request.method == 'OPTIONS':
@@ -100,18 +116,66 @@ def login():
 
         user = User.query.filter_by(email=email).first()
 
-        if not user or not check_password_hash(user.password, password):
+        if not user or not hasher.verify(user.password, password):
             return jsonify({"error": "Invalid email or password"}), 401
 
-        token = create_access_token(identity=user.id)
-        
-        return jsonify({
+        # Transparently upgrade hashes made with an older method or cost
+        if hasher.needs_rehash(user.password):
+            user.password = hasher.hash(password)
+            db.session.commit()
+            invalidate_user(user.id)
+
+        token, refresh_token = issue_tokens(user.id)
+
+        response = jsonify({
             "message": "Login successful",
             "access_token": token,
             "user": user.to_dict()
-        }), 200
+        })
+        if refresh_token:
+            set_refresh_cookie(response, refresh_token)
+        return response, 200
 
+    except HasherSaturated:
+        db.session.rollback()
+        return too_busy()
     except Exception as e:
         print(f"Login error: {str(e)}")
         return jsonify({"error": f"An error occurred while logging in: {str(e)}"}), 500
 
+
+# Exchange the refresh token (HttpOnly cookie, or "refresh_token" in the JSON
+# body for non-browser clients) for a new access token. No password hash and
+# no database write: the refresh token rotates and the old one is retired.
+@auth_bp.route('/refresh', methods=['POST'])
+@rate_limit('30/minute', key='ip')
+@jwt_required(refresh=True, locations=['cookies', 'json'])
+def refresh():
+    try:
+        status, token, refresh_token = rotate_tokens(get_jwt())
+    except Exception:
+        current_app.logger.exception("Refresh failed")
+        return jsonify({"error": "Could not refresh the session, please retry"}), 503
+
+    if status not in (ROTATED, GRACE):
+        error = "Session revoked after refresh token reuse" if status == REUSED else "Session has ended"
+        response = jsonify({"error": f"{error}, please log in again"})
+        unset_refresh_cookies(response)
+        return response, 401
+
+    response = jsonify({"access_token": token})
+    if refresh_token:
+        set_refresh_cookie(response, refresh_token)
+    return response, 200
+
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(refresh=True, locations=['cookies', 'json'], optional=True)
+def logout():
+    try:
+        revoke_tokens(get_jwt())
+    except Exception:
+        current_app.logger.exception("Logout could not revoke the refresh token")
+    response = jsonify({"message": "Logged out"})
+    unset_refresh_cookies(response)
+    return response, 200
@@ -0,0 +1,290 @@
+# Load-testing harness for the Flask API.
+#
+#   python -m backend.bench_api --scale 10000 --requests 5000 --output bench.json
+#   python -m backend.bench_api --scale 10000 --requests 5000 --compare bench.json
+#
+# Boots `app` against a throwaway SQLite database (or --database-uri, e.g. a
+# local MySQL), seeds synthetic users/workers/employers/jobs/applications,
+# then drives a weighted mix of API calls through the WSGI test client and
+# reports throughput, latency percentiles and SQL statements per endpoint.
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+TRADES = ["welder", "electrician", "plumber", "carpenter", "mason", "painter", "roofer", "mechanic",
+          "driver", "forklift", "warehouse", "hvac", "machinist", "landscaper", "janitor", "cook",
+          "pipefitter", "ironworker", "glazier", "drywall", "concrete", "excavator", "crane", "tiler"]
+LEVELS = ["", "senior", "junior", "lead", "apprentice", "certified"]
+CITIES = [("Houston", "Texas"), ("Chicago", "Illinois"), ("Phoenix", "Arizona"), ("Dallas", "Texas"),
+          ("Atlanta", "Georgia"), ("Denver", "Colorado"), ("Mumbai", "Maharashtra"), ("Pune", "Maharashtra")]
+JOB_TYPES = ["full-time", "part-time", "contract", "temporary"]
+SALARY_TYPES = ["hourly", "weekly", "monthly", "yearly"]
+
+PASSWORD = "Benchmark1"
+
+# Relative weights of each scenario in the request mix
+DEFAULT_MIX = {
+    "login": 5,
+    "list_jobs": 35,
+    "recommendations": 25,
+    "apply": 10,
+    "update_profile": 10,
+    "me": 15,
+}
+
+
+def configure_environment(args):
+    # Must run before backend.config is imported: profiles read the environment at import
+    os.environ["DATABASE_URI"] = args.database_uri
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    os.environ["SQL_QUERY_COUNT_HEADER"] = "True"
+    # Every simulated user shares one client IP; measure the endpoints, not the limiter
+    os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+    if args.no_cache:
+        os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)), text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _chunks(rows, size=5000):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def seed(db, models, scale, rng):
+    """Insert `scale` users (80% workers, 20% employers) plus jobs and applications."""
+    from werkzeug.security import generate_password_hash
+    User, Worker, Employer, Job, Application = models
+
+    if User.query.first() is not None:
+        return  # reuse an already seeded database
+
+    password_hash = generate_password_hash(PASSWORD)
+    now = datetime.utcnow()
+    employer_count = max(scale // 5, 1)
+    worker_count = max(scale - employer_count, 1)
+
+    def insert(table, rows):
+        for chunk in _chunks(rows):
+            db.session.execute(table.insert(), chunk)
+        db.session.commit()
+
+    users = []
+    for i in range(worker_count + employer_count):
+        city, state = rng.choice(CITIES)
+        users.append({"id": i + 1, "name": f"User {i + 1}", "email": f"user{i + 1}@bench.test",
+                      "password": password_hash, "location": f"{city}, {state}"})
+    insert(User.__table__, users)
+
+    workers = []
+    for i in range(worker_count):
+        skills = rng.sample(TRADES, 3)
+        workers.append({"id": i + 1, "user_id": i + 1, "name": f"User {i + 1}", "age": rng.randint(18, 60),
+                        "years_experience": rng.randint(0, 25), "contact_number": "5550000000",
+                        "email": f"user{i + 1}@bench.test", "skills": ",".join(skills),
+                        "preferred_job_titles": skills[0], "desired_salary": rng.randint(20, 90) * 1000})
+    insert(Worker.__table__, workers)
+
+    employers = []
+    for i in range(employer_count):
+        user_id = worker_count + i + 1
+        city, state = rng.choice(CITIES)
+        employers.append({"id": i + 1, "user_id": user_id, "name": f"User {user_id}",
+                          "company_name": f"Company {i + 1}", "address": f"{i + 1} Main St, {city}, {state}",
+                          "contact_number": "5550000000", "email": f"user{user_id}@bench.test",
+                          "industry": "Construction"})
+    insert(Employer.__table__, employers)
+
+    jobs = []
+    for i in range(scale):
+        low = rng.randint(20, 80) * 1000
+        jobs.append({"id": i + 1, "title": f"{rng.choice(LEVELS)} {rng.choice(TRADES)}".strip(),
+                     "salary_min": low, "salary_max": low + rng.randint(0, 30) * 1000,
+                     "salary_type": rng.choice(SALARY_TYPES), "job_type": rng.choice(JOB_TYPES),
+                     # post_job stores the posting user's id as employer_id
+                     "employer_id": worker_count + rng.randint(1, employer_count),
+                     "posted_date": now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+                     "deadline_date": now + timedelta(days=rng.randint(-30, 60))})
+    insert(Job.__table__, jobs)
+
+    applications = []
+    seen = set()
+    for _ in range(scale):
+        pair = (rng.randint(1, worker_count), rng.randint(1, scale))
+        if pair not in seen:
+            seen.add(pair)
+            applications.append({"worker_id": pair[0], "job_id": pair[1], "status": "pending", "applied_on": now})
+    insert(Application.__table__, applications)
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, name, latency, status, sql_count):
+        with self._lock:
+            self.samples.setdefault(name, []).append((latency, status, sql_count))
+
+    def summary(self, elapsed):
+        def percentile(values, p):
+            index = min(int(round(p / 100 * (len(values) - 1))), len(values) - 1)
+            return values[index]
+
+        report = {}
+        for name, samples in sorted(self.samples.items()):
+            latencies = sorted(latency * 1000 for latency, _, _ in samples)
+            sql_counts = [count for _, _, count in samples if count is not None]
+            report[name] = {
+                "requests": len(samples),
+                # 4xx are expected in the mix (e.g. re-applying to a job); 5xx are failures
+                "client_errors": sum(1 for _, status, _ in samples if 400 <= status < 500),
+                "errors": sum(1 for _, status, _ in samples if status >= 500),
+                "throughput_rps": round(len(samples) / elapsed, 1),
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p90_ms": round(percentile(latencies, 90), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+                "max_ms": round(latencies[-1], 2),
+                "avg_sql": round(sum(sql_counts) / len(sql_counts), 2) if sql_counts else None,
+            }
+        return report
+
+
+def drive(app, worker_count, employer_count, job_count, args, rng):
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        tokens = {user_id: create_access_token(identity=str(user_id))
+                  for user_id in rng.sample(range(1, worker_count + 1), min(worker_count, 200))}
+    worker_ids = list(tokens)
+
+    def auth(user_id):
+        return {"Authorization": f"Bearer {tokens[user_id]}"}
+
+    scenarios = {
+        "login": lambda c, r: c.post("/auth/login", json={
+            "email": f"user{r.choice(worker_ids)}@bench.test", "password": PASSWORD}),
+        "list_jobs": lambda c, r: c.get("/jobs/", query_string={
+            "limit": 50, "open": "true", **({"job_type": r.choice(JOB_TYPES)} if r.random() < 0.5 else {})}),
+        "recommendations": lambda c, r: c.get("/jobs/recommendations", headers=auth(r.choice(worker_ids))),
+        "apply": lambda c, r: c.post("/applications/apply", headers=auth(r.choice(worker_ids)),
+                                     json={"job_id": r.randint(1, job_count)}),
+        "update_profile": lambda c, r: c.post("/users/worker/profile", headers=auth(r.choice(worker_ids)),
+                                              json={"experience": r.randint(0, 30)}),
+        "me": lambda c, r: c.get("/users/me", headers=auth(r.choice(worker_ids))),
+    }
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    recorder = Recorder()
+
+    def run_worker(seed_offset, count):
+        r = random.Random(args.seed + seed_offset)
+        client = app.test_client()
+        for _ in range(count):
+            name = r.choices(names, weights)[0]
+            start = time.perf_counter()
+            response = scenarios[name](client, r)
+            latency = time.perf_counter() - start
+            sql_count = response.headers.get("X-SQL-Query-Count")
+            recorder.record(name, latency, response.status_code, int(sql_count) if sql_count else None)
+
+    per_thread = args.requests // args.threads
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(lambda i: run_worker(i, per_thread), range(args.threads)))
+    elapsed = time.perf_counter() - start
+    return recorder, elapsed
+
+
+def compare(current, previous_path):
+    with open(previous_path) as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path} (revision {previous.get('revision')}):")
+    for name, stats in current["endpoints"].items():
+        before = previous.get("endpoints", {}).get(name)
+        if not before:
+            continue
+        for key in ("throughput_rps", "p50_ms", "p99_ms", "avg_sql"):
+            if stats.get(key) is None or not before.get(key):
+                continue
+            change = (stats[key] - before[key]) / before[key] * 100
+            print(f"  {name:>16} {key:>15}: {before[key]:>10} -> {stats[key]:>10} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Flask API")
+    parser.add_argument("--scale", type=int, default=10000, help="users and jobs to seed (10k-1M)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--database-uri", default=None,
+                        help="defaults to a fresh SQLite file in the temp directory")
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX,
+                        help='scenario weights as JSON, e.g. \'{"list_jobs": 1}\'')
+    parser.add_argument("--no-cache", action="store_true", help="disable the response cache")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="write results as JSON to this path")
+    parser.add_argument("--compare", default=None, help="previous results JSON to diff against")
+    args = parser.parse_args()
+
+    if not args.database_uri:
+        path = os.path.join(tempfile.gettempdir(), f"bench_{args.scale}.db")
+        args.database_uri = f"sqlite:///{path}"
+    configure_environment(args)
+
+    from backend.app import create_app
+    from backend.models import db, User, Worker, Employer, Job, Application
+
+    app = create_app('production')
+    rng = random.Random(args.seed)
+    with app.app_context():
+        db.create_all()
+        seed_start = time.perf_counter()
+        seed(db, (User, Worker, Employer, Job, Application), args.scale, rng)
+        worker_count = Worker.query.count()
+        employer_count = Employer.query.count()
+        job_count = Job.query.count()
+        print(f"Database ready in {time.perf_counter() - seed_start:.1f}s: "
+              f"{worker_count} workers, {employer_count} employers, {job_count} jobs", file=sys.stderr)
+
+    recorder, elapsed = drive(app, worker_count, employer_count, job_count, args, rng)
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "scale": args.scale,
+        "requests": args.requests,
+        "threads": args.threads,
+        "database": args.database_uri.split(":", 1)[0],
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(sum(len(s) for s in recorder.samples.values()) / elapsed, 1),
+        "endpoints": recorder.summary(elapsed),
+    }
+
+    print(f"\n{'endpoint':>16} {'reqs':>6} {'err':>5} {'rps':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'sql':>6}")
+    for name, stats in results["endpoints"].items():
+        print(f"{name:>16} {stats['requests']:>6} {stats['errors']:>5} {stats['throughput_rps']:>8} "
+              f"{stats['p50_ms']:>8} {stats['p90_ms']:>8} {stats['p99_ms']:>8} {stats['avg_sql'] or '-':>6}")
+    print(f"\nTotal: {results['throughput_rps']} req/s over {results['elapsed_s']}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
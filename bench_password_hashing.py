@@ -0,0 +1,74 @@
+# Benchmark login hashing throughput, inline versus the process pool.
+#
+#   python -m backend.bench_password_hashing --logins 200 --threads 16
+#
+# "inline" is the old behaviour (check_password_hash on the request thread);
+# "pool" routes the same verifications through PasswordHasher's process pool.
+import os
+import time
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash
+from backend.password_hashing import PasswordHasher, HasherSaturated, default_workers
+
+
+def run(hasher, password_hash, password, logins, threads):
+    rejected = 0
+
+    def login(_):
+        nonlocal rejected
+        while True:
+            try:
+                return hasher.verify(password_hash, password)
+            except HasherSaturated:
+                # A real client would honour Retry-After; back off briefly
+                rejected += 1
+                time.sleep(0.005)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    return logins / elapsed, rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--method', default=None, help="werkzeug hash method, e.g. scrypt:32768:8:1")
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=16, help="concurrent request threads")
+    parser.add_argument('--workers', type=int, default=default_workers())
+    parser.add_argument('--queue-depth', type=int, default=None)
+    parser.add_argument('--output', default=None, help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    password = "Benchmark1"
+    password_hash = generate_password_hash(password, args.method) if args.method else generate_password_hash(password)
+    cores = os.cpu_count() or 1
+
+    results = {"method": password_hash.split('$', 1)[0], "cores": cores, "threads": args.threads}
+    for label, hasher in (
+        ("inline", PasswordHasher(args.method, workers=0, queue_depth=args.threads)),
+        ("pool", PasswordHasher(args.method, workers=args.workers, queue_depth=args.queue_depth)),
+    ):
+        hasher.verify(password_hash, password)  # warm up the pool
+        throughput, rejected = run(hasher, password_hash, password, args.logins, args.threads)
+        hasher.shutdown()
+        used_cores = 1 if label == "inline" else min(args.workers, cores)
+        results[label] = {
+            "logins_per_sec": round(throughput, 1),
+            "logins_per_sec_per_core": round(throughput / used_cores, 1),
+            "saturated_retries": rejected,
+            "workers": 0 if label == "inline" else args.workers,
+        }
+        print(f"{label:>6}: {throughput:8.1f} logins/s  "
+              f"({throughput / used_cores:.1f}/s per core, {rejected} saturated retries)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# Measure cold start and per-worker memory of the web app.
+#
+#   python -m backend.bench_startup --runs 5 --profile production
+#
+# Each run is a fresh interpreter, as a gunicorn worker without preload_app
+# would be: it reports the time to import the code, to build the app with
+# create_app(), and to serve a first request, the RSS after each step, and
+# how many DB connections/statements startup made (both should be 0).
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+PROBE = r'''
+import json, os, sys, time
+start = time.perf_counter()
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+connections = []
+event.listen(Pool, 'connect', lambda *args: connections.append(1))
+
+import backend.app
+from backend.instrumentation import count_queries
+imported = time.perf_counter()
+rss_imported = rss_mb()
+
+with count_queries() as startup_queries:
+    app = backend.app.create_app(sys.argv[1])
+created = time.perf_counter()
+rss_created = rss_mb()
+startup_connections = len(connections)
+
+response = app.test_client().get('/metrics')
+first_request = time.perf_counter()
+
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (first_request - created) * 1000,
+    "total_ms": (first_request - start) * 1000,
+    "rss_imported_mb": rss_imported,
+    "rss_created_mb": rss_created,
+    "rss_first_request_mb": rss_mb(),
+    "startup_db_connections": startup_connections,
+    "startup_sql_statements": startup_queries.count,
+    "status": response.status_code,
+}))
+'''
+
+
+def run_probe(profile, env):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, profile],
+        env=env, check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app cold start and memory")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", default="production")
+    parser.add_argument("--output", default=None, help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # Point at a database that can't be opened: any DB round-trip during startup fails loudly
+    env.setdefault("DATABASE_URI", "sqlite:////nonexistent/startup-probe.db")
+    env.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+    runs = [run_probe(args.profile, env) for _ in range(args.runs)]
+    summary = {key: round(statistics.median(run[key] for run in runs), 2) for key in runs[0] if key != "status"}
+    summary["startup_db_connections"] = max(run["startup_db_connections"] for run in runs)
+    summary["startup_sql_statements"] = max(run["startup_sql_statements"] for run in runs)
+    results = {"profile": args.profile, "runs": args.runs, "median": summary, "samples": runs}
+
+    for key, value in summary.items():
+        print(f"{key:>24}: {value}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
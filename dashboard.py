@@ -0,0 +1,115 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy import func
+from backend.models import db, Job, Worker, Application, JobMatch, JobApplicationStats
+from backend.serialization import job_schema, worker_schema, respond
+from backend.recommendations import recommend_for_worker, DEFAULT_LIMIT
+from backend.matching import FOR_JOB
+from backend.application_stats import APPLICATION_STATUSES
+from backend.rate_limit import rate_limit
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+# One round trip per dashboard instead of a fan-out of profile, job and
+# application requests, each paying for its own JWT decode and user lookup.
+# Not response-cached: application counts change without an invalidation.
+
+DEFAULT_JOB_LIMIT = 20
+MAX_JOB_LIMIT = 100
+
+
+def _limit(default):
+    return max(1, min(request.args.get('limit', default, type=int), MAX_JOB_LIMIT))
+
+
+def _counts(rows):
+    counts = {status: 0 for status in APPLICATION_STATUSES}
+    for status, count in rows:
+        counts[status] = counts.get(status, 0) + count
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+@dashboard_bp.route('/worker', methods=['GET'])
+@rate_limit('60/minute')
+@jwt_required()
+def worker_dashboard():
+    worker = current_user.worker if current_user else None
+    if not worker:
+        return jsonify({"error": "Worker profile not found"}), 404
+
+    recommendations = recommend_for_worker(worker, _limit(DEFAULT_LIMIT))
+    # Applications are owned by the user id (see apply_to_job)
+    status_rows = (
+        db.session.query(Application.status, func.count(Application.id))
+        .filter(Application.worker_id == current_user.id)
+        .group_by(Application.status)
+        .all()
+    )
+    return respond({
+        "profile": worker.to_dict(),
+        "recommended_jobs": [
+            dict(job_schema.encode(job), match_score=round(score, 4)) for job, score in recommendations
+        ],
+        "applications": _counts(status_rows),
+    })
+
+
+@dashboard_bp.route('/employer', methods=['GET'])
+@rate_limit('60/minute')
+@jwt_required()
+def employer_dashboard():
+    employer = current_user.employer if current_user else None
+    if not employer:
+        return jsonify({"error": "Employer profile not found"}), 404
+
+    # Jobs are owned by the user id (see post_job)
+    employer_id = get_jwt_identity()
+    rows = (
+        db.session.query(Job, JobApplicationStats)
+        .outerjoin(JobApplicationStats, JobApplicationStats.job_id == Job.id)
+        .filter(Job.employer_id == employer_id)
+        .order_by(Job.posted_date.desc(), Job.id.desc())
+        .limit(_limit(DEFAULT_JOB_LIMIT))
+        .all()
+    )
+    jobs = []
+    for job, stats in rows:
+        counts = {column: getattr(stats, column) if stats else 0 for column in ('total',) + APPLICATION_STATUSES}
+        jobs.append(dict(job_schema.encode(job), applications=counts))
+
+    totals = (
+        db.session.query(*[
+            func.coalesce(func.sum(getattr(JobApplicationStats, column)), 0)
+            for column in APPLICATION_STATUSES
+        ])
+        .filter(JobApplicationStats.employer_id == employer_id)
+        .one()
+    )
+
+    # Best precomputed candidate per worker across the listed jobs
+    recommended = []
+    if jobs:
+        best = (
+            db.session.query(JobMatch.worker_id, func.max(JobMatch.score).label('score'))
+            .filter(JobMatch.job_id.in_([job['id'] for job in jobs]), JobMatch.direction == FOR_JOB)
+            .group_by(JobMatch.worker_id)
+            .subquery()
+        )
+        matches = (
+            db.session.query(Worker, best.c.score)
+            .join(best, best.c.worker_id == Worker.id)
+            .order_by(best.c.score.desc(), Worker.id)
+            .limit(DEFAULT_JOB_LIMIT)
+            .all()
+        )
+        recommended = [
+            dict(worker_schema.encode(worker), match_score=round(score, 4)) for worker, score in matches
+        ]
+
+    return respond({
+        "profile": employer.to_dict(),
+        "jobs": jobs,
+        "applications": _counts(zip(APPLICATION_STATUSES, map(int, totals))),
+        "recommended_workers": recommended,
+    })
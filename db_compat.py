@@ -0,0 +1,25 @@
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from backend.models import db
+
+
+def supports_returning():
+    """Whether the primary database can return rows from an INSERT (not MySQL)."""
+    return db.engine.dialect.insert_returning
+
+
+def insert_ignore(model, columns, rows, conflict_columns):
+    """INSERT ... SELECT that silently skips rows hitting the unique key on `conflict_columns`.
+
+    Rows come from a SELECT so missing parents simply produce no row; that
+    matters on MySQL, where INSERT IGNORE would otherwise downgrade foreign
+    key errors to warnings as well.
+    """
+    table = model.__table__
+    dialect = db.engine.dialect.name
+    if dialect == 'mysql':
+        return mysql.insert(table).prefix_with('IGNORE').from_select(columns, rows)
+    if dialect == 'postgresql':
+        return postgresql.insert(table).from_select(columns, rows).on_conflict_do_nothing(index_elements=conflict_columns)
+    if dialect == 'sqlite':
+        return sqlite.insert(table).from_select(columns, rows).on_conflict_do_nothing(index_elements=conflict_columns)
+    raise NotImplementedError(f"insert_ignore is not implemented for {dialect}")
@@ -0,0 +1,158 @@
+import time
+import random
+import logging
+import functools
+from flask import g, request, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql.expression import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = ('GET', 'HEAD')
+STICKY_COOKIE = 'db_primary_until'
+
+DEFAULT_RETRY_SECONDS = 30
+DEFAULT_STICKY_SECONDS = 5
+
+
+def replica_key(index):
+    return f'replica_{index}'
+
+
+class ReplicaRouter:
+    """Picks a healthy replica bind for read-only requests.
+
+    A replica that fails with a connection error is taken out of rotation
+    for `retry_seconds`; it is then probed with SELECT 1 before serving
+    again. When no replica is healthy, reads fall back to the primary.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.retry_seconds = DEFAULT_RETRY_SECONDS
+        self._down_until = {}
+
+    def configure(self, keys, retry_seconds=DEFAULT_RETRY_SECONDS):
+        self.keys = list(keys)
+        self.retry_seconds = retry_seconds
+        self._down_until = {}
+
+    def mark_down(self, key):
+        if key in self.keys and not self.is_down(key):
+            logger.warning(f"Read replica {key} unavailable; routing its reads elsewhere for {self.retry_seconds}s")
+        self._down_until[key] = time.monotonic() + self.retry_seconds
+
+    def is_down(self, key):
+        return self._down_until.get(key, 0) > time.monotonic()
+
+    def _probe(self, engines, key):
+        try:
+            with engines[key].connect() as connection:
+                connection.execute(text('SELECT 1'))
+        except OperationalError:
+            self.mark_down(key)
+            return False
+        self._down_until.pop(key, None)
+        logger.info(f"Read replica {key} is back in rotation")
+        return True
+
+    def choose(self, engines):
+        """Return the bind key of a healthy replica, or None for the primary."""
+        candidates = [key for key in self.keys if not self.is_down(key)]
+        random.shuffle(candidates)
+        for key in candidates:
+            # Replicas that were down get a health check before taking traffic again
+            if key not in self._down_until or self._probe(engines, key):
+                return key
+        return None
+
+
+router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """Session that sends the reads of a replica-routed request to that replica.
+
+    Anything that writes (flushes, INSERT/UPDATE/DELETE statements) always
+    goes to the primary, as does all work outside a request. If the replica
+    can't be reached the request falls back to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not isinstance(clause, UpdateBase):
+            key = g.get('db_replica') if has_request_context() else None
+            if key is not None:
+                engine = self._db.engines[key]
+                try:
+                    # Checks out (and pings) the replica connection up front; later
+                    # statements in the transaction reuse it
+                    self.connection(bind_arguments={'bind': engine})
+                    return engine
+                except OperationalError:
+                    router.mark_down(key)
+                    g.db_replica = None
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def use_primary(view):
+    """Serve a GET view from the primary (for reads that must never be stale)."""
+    view.use_primary = True
+    return view
+
+
+def read_only(view):
+    """Treat a non-GET view (e.g. a POST that only carries a query body) as a read."""
+    view.read_only = True
+    return view
+
+
+def _is_read(app):
+    return request.method in READ_METHODS or getattr(app.view_functions.get(request.endpoint), 'read_only', False)
+
+
+def _sticky():
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def init_db_routing(app, db):
+    keys = list(app.config.get('SQLALCHEMY_BINDS', {}))
+    router.configure(
+        [key for key in keys if key.startswith('replica_')],
+        app.config.get('REPLICA_RETRY_SECONDS', DEFAULT_RETRY_SECONDS)
+    )
+    if not router.keys:
+        return
+
+    sticky_seconds = app.config.get('READ_YOUR_WRITES_SECONDS', DEFAULT_STICKY_SECONDS)
+
+    @app.before_request
+    def route_request():
+        if not _is_read(app) or _sticky():
+            return
+        view = app.view_functions.get(request.endpoint)
+        if getattr(view, 'use_primary', False):
+            return
+        g.db_replica = router.choose(db.engines)
+
+    @app.after_request
+    def stick_to_primary_after_write(response):
+        # Reads in the next few seconds go to the primary so a client sees its
+        # own writes even while the replicas are catching up
+        if request.method != 'OPTIONS' and not _is_read(app) and response.status_code < 400 and sticky_seconds:
+            response.set_cookie(STICKY_COOKIE, str(time.time() + sticky_seconds),
+                                max_age=sticky_seconds, httponly=True, samesite='Lax')
+        return response
+
+    with app.app_context():
+        for key in router.keys:
+            event.listen(db.engines[key], 'handle_error', functools.partial(_on_replica_error, key))
+
+
+def _on_replica_error(key, context):
+    if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+        router.mark_down(key)
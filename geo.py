@@ -0,0 +1,220 @@
+import os
+import csv
+import math
+import threading
+from sqlalchemy import or_
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gazetteer.csv')
+
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_RADIUS_KM = 25.0
+MAX_RADIUS_KM = 500.0
+GEOHASH_PRECISION = 9
+MAX_COVERING_CELLS = 16
+# nearest() ranks in SQL by an approximate distance and re-ranks this many
+# candidates per requested result exactly
+NEAREST_CANDIDATE_FACTOR = 3
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def _key(value):
+    return " ".join(value.lower().replace('.', '').split())
+
+
+def _load_gazetteer():
+    global _gazetteer
+    with _gazetteer_lock:
+        if _gazetteer is None:
+            places = {}
+            with open(GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    coordinates = (float(row['latitude']), float(row['longitude']))
+                    city = _key(row['city'])
+                    place = (row['city'], row['state'], coordinates)
+                    places[(city, _key(row['state']))] = place
+                    places[(city, _key(row['state_code']))] = place
+                    # City-only lookups resolve only when the name is unambiguous
+                    places[(city, None)] = None if (city, None) in places else place
+            _gazetteer = places
+    return _gazetteer
+
+
+def parse_location(value):
+    """Split a "city, state" string (or {"city", "state"} dict) into its parts."""
+    if not value:
+        return None, None
+    if isinstance(value, dict):
+        return value.get('city') or None, value.get('state') or None
+    parts = [part.strip() for part in value.split(",")]
+    return parts[0] or None, (parts[1] if len(parts) > 1 and parts[1] else None)
+
+
+def address_location(address):
+    # Employer addresses are packed as "street, city, state"
+    parts = [part.strip() for part in (address or "").split(",")]
+    return ", ".join(parts[1:3]) if len(parts) > 1 else None
+
+
+def geocode(city, state=None):
+    """Return (city, state, (lat, lon)) from the bundled gazetteer, or None."""
+    if not city:
+        return None
+    places = _load_gazetteer()
+    if state:
+        return places.get((_key(city), _key(state)))
+    return places.get((_key(city), None))
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, value = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            target[0] = middle
+        else:
+            target[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def _cell_size_degrees(precision):
+    lon_bits = math.ceil(5 * precision / 2)
+    lat_bits = math.floor(5 * precision / 2)
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def bounding_box(latitude, longitude, radius_km):
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    lon_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * max(math.cos(math.radians(latitude)), 0.01)))
+    return (max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0),
+            max(longitude - lon_delta, -180.0), min(longitude + lon_delta, 180.0))
+
+
+def covering_prefixes(latitude, longitude, radius_km):
+    """Geohash prefixes whose cells together cover the search circle.
+
+    Picks the finest precision that still needs at most MAX_COVERING_CELLS
+    cells, so each prefix becomes one index range scan.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lon = _cell_size_degrees(precision)
+        rows = math.ceil((max_lat - min_lat) / cell_lat) + 1
+        columns = math.ceil((max_lon - min_lon) / cell_lon) + 1
+        if rows * columns > MAX_COVERING_CELLS * 4:
+            continue
+        prefixes = set()
+        # Sample at half-cell steps so every overlapped cell is hit
+        lat = min_lat
+        while lat <= max_lat + cell_lat / 2:
+            lon = min_lon
+            while lon <= max_lon + cell_lon / 2:
+                prefixes.add(geohash_encode(min(lat, max_lat), min(lon, max_lon), precision))
+                lon += cell_lon / 2
+            lat += cell_lat / 2
+        if len(prefixes) <= MAX_COVERING_CELLS:
+            return sorted(prefixes)
+    return ['']
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def parse_near(args):
+    """Read ?near=<lat,lon | city, state>&radius_km= ; returns None or (lat, lon, radius_km)."""
+    near = args.get('near')
+    if not near:
+        return None
+    try:
+        radius_km = float(args.get('radius_km', DEFAULT_RADIUS_KM))
+    except ValueError:
+        raise ValueError("radius_km must be a number")
+    if radius_km <= 0:
+        raise ValueError("radius_km must be positive")
+    radius_km = min(radius_km, MAX_RADIUS_KM)
+
+    parts = [part.strip() for part in near.split(",")]
+    if len(parts) == 2:
+        try:
+            return float(parts[0]), float(parts[1]), radius_km
+        except ValueError:
+            pass
+    place = geocode(*parse_location(near))
+    if not place:
+        raise ValueError(f"Unknown location: {near}")
+    latitude, longitude = place[2]
+    return latitude, longitude, radius_km
+
+
+def apply_location(obj, value):
+    """Set the normalized location columns on a Worker, Employer or Job."""
+    city, state = parse_location(value)
+    place = geocode(city, state)
+    if place:
+        city, state, (latitude, longitude) = place
+        obj.latitude, obj.longitude = latitude, longitude
+        obj.geohash = geohash_encode(latitude, longitude)
+    else:
+        obj.latitude = obj.longitude = obj.geohash = None
+    obj.city, obj.state = city, state
+
+
+def location_columns(source):
+    """Location column values copied from `source` (e.g. a job's employer)."""
+    if source is None:
+        return {}
+    return {key: getattr(source, key) for key in ('city', 'state', 'latitude', 'longitude', 'geohash')}
+
+
+def filter_near(query, model, near):
+    """Restrict `query` to rows in the geohash cells and bounding box around `near`."""
+    latitude, longitude, radius_km = near
+    prefixes = covering_prefixes(latitude, longitude, radius_km)
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    return query.filter(
+        or_(*[model.geohash.like(prefix + '%') for prefix in prefixes]),
+        model.latitude.between(min_lat, max_lat),
+        model.longitude.between(min_lon, max_lon)
+    )
+
+
+def nearest(query, model, near, limit):
+    """Return up to `limit` (obj, distance_km) pairs within the radius, closest first.
+
+    The database orders the box by squared equirectangular distance and
+    returns a bounded candidate set, so a dense area never loads in full;
+    the candidates are then ranked by haversine distance.
+    """
+    latitude, longitude, radius_km = near
+    d_lat = model.latitude - latitude
+    d_lon = (model.longitude - longitude) * math.cos(math.radians(latitude))
+    candidates = (
+        filter_near(query, model, near)
+        .order_by(d_lat * d_lat + d_lon * d_lon)
+        .limit(limit * NEAREST_CANDIDATE_FACTOR)
+        .all()
+    )
+    results = []
+    for obj in candidates:
+        distance = haversine_km(latitude, longitude, obj.latitude, obj.longitude)
+        if distance <= radius_km:
+            results.append((obj, distance))
+    results.sort(key=lambda pair: pair[1])
+    return results[:limit]
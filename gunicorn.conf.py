@@ -0,0 +1,36 @@
+# gunicorn settings for backend.wsgi:app; every value can be overridden from the environment.
+#
+# Worker model:
+#   gthread (default) - a few processes x N threads; safe with any DB driver.
+#   gevent            - thousands of greenlets per process for I/O-bound load
+#                       (install gevent, and use a pure-Python driver such as
+#                       PyMySQL so queries yield to the event loop). Prefer it
+#                       when serving /jobs/stream, which holds a thread per
+#                       open stream under gthread (JOB_STREAM_MAX_CONNECTIONS
+#                       defaults to half of GUNICORN_THREADS there).
+# Each worker process holds its own SQLAlchemy pool of DB_POOL_SIZE +
+# DB_MAX_OVERFLOW connections; ProductionConfig splits DB_CONNECTION_BUDGET
+# across WEB_CONCURRENCY workers so workers x that stays below max_connections.
+import os
+import multiprocessing
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers periodically to cap slow memory growth
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+# Import the app once in the master and fork it: workers share the imported
+# code copy-on-write and start instantly. Safe because create_app() opens no
+# DB connections and the password-hashing pool is created lazily per worker.
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
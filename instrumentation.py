@@ -0,0 +1,218 @@
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from flask import g, has_request_context, request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_local = threading.local()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+    if has_request_context():
+        g.sql_statement_count = g.get('sql_statement_count', 0) + 1
+    for counter in getattr(_local, 'counters', ()):
+        counter.append(statement)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('query_start_time')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if has_request_context():
+        g.sql_time = g.get('sql_time', 0.0) + elapsed
+        if 'sql_statements' in g:
+            g.sql_statements.append((elapsed, statement))
+
+
+event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+class QueryCount:
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def append(self, statement):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(max_queries=None):
+    """Record every SQL statement run in this thread inside the block.
+
+    If `max_queries` is given an AssertionError is raised when the block
+    ran more statements than that, which lets tests pin down N+1 fixes.
+    """
+    counter = QueryCount()
+    counters = getattr(_local, 'counters', [])
+    _local.counters = counters + [counter]
+    try:
+        yield counter
+    finally:
+        _local.counters = [c for c in _local.counters if c is not counter]
+
+    if max_queries is not None and counter.count > max_queries:
+        raise AssertionError(
+            f"Expected at most {max_queries} SQL statements, ran {counter.count}:\n" +
+            "\n".join(counter.statements)
+        )
+
+
+def request_query_count():
+    return g.get('sql_statement_count', 0) if has_request_context() else 0
+
+
+def timed_serialization(to_dict):
+    """Charge time spent in a model's to_dict to the current request.
+
+    Nested calls (User.to_dict serializing its worker) are only counted
+    once, at the outermost call.
+    """
+    @functools.wraps(to_dict)
+    def wrapper(*args, **kwargs):
+        if not has_request_context():
+            return to_dict(*args, **kwargs)
+        depth = g.get('serialization_depth', 0)
+        g.serialization_depth = depth + 1
+        start = time.perf_counter()
+        try:
+            return to_dict(*args, **kwargs)
+        finally:
+            g.serialization_depth = depth
+            if depth == 0:
+                g.serialization_time = g.get('serialization_time', 0.0) + time.perf_counter() - start
+    return wrapper
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.request_count = 0
+        self.latency_sum = 0.0
+        self.status_counts = {}
+        self.sql_statements = 0
+        self.sql_time = 0.0
+        self.serialization_time = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def observe(self, endpoint, method, status, latency, sql_statements, sql_time, serialization_time):
+        with self._lock:
+            metrics = self._endpoints.setdefault((endpoint, method), EndpointMetrics())
+            metrics.request_count += 1
+            metrics.latency_sum += latency
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    metrics.bucket_counts[i] += 1
+            metrics.status_counts[status] = metrics.status_counts.get(status, 0) + 1
+            metrics.sql_statements += sql_statements
+            metrics.sql_time += sql_time
+            metrics.serialization_time += serialization_time
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._endpoints.items())
+            lines = [
+                "# HELP http_request_duration_seconds Request latency by endpoint.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (endpoint, method), m in items:
+                labels = f'endpoint="{_escape(endpoint)}",method="{method}"'
+                for bound, count in zip(LATENCY_BUCKETS, m.bucket_counts):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {m.request_count}')
+                lines.append(f'http_request_duration_seconds_sum{{{labels}}} {m.latency_sum:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{{labels}}} {m.request_count}')
+
+            lines += [
+                "# HELP http_requests_total Requests by endpoint and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (endpoint, method), m in items:
+                for status, count in sorted(m.status_counts.items()):
+                    lines.append(
+                        f'http_requests_total{{endpoint="{_escape(endpoint)}",method="{method}",status="{status}"}} {count}'
+                    )
+
+            for name, attribute, help_text in (
+                ("sql_statements_total", "sql_statements", "SQL statements executed by endpoint."),
+                ("sql_duration_seconds_total", "sql_time", "Time spent executing SQL by endpoint."),
+                ("serialization_duration_seconds_total", "serialization_time", "Time spent in model to_dict by endpoint."),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (endpoint, method), m in items:
+                    value = getattr(m, attribute)
+                    value = f"{value:.6f}" if isinstance(value, float) else value
+                    lines.append(f'{name}{{endpoint="{_escape(endpoint)}",method="{method}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = MetricsRegistry()
+
+
+def init_instrumentation(app):
+    @app.before_request
+    def start_request_timer():
+        g.request_start_time = time.perf_counter()
+        g.sql_statement_count = 0
+        g.sql_time = 0.0
+        g.serialization_time = 0.0
+        if app.config.get('SLOW_REQUEST_THRESHOLD_MS'):
+            g.sql_statements = []
+
+    @app.after_request
+    def record_request_metrics(response):
+        # Opt-in header so clients and load tests can see per-request SQL counts
+        if app.config.get('SQL_QUERY_COUNT_HEADER'):
+            response.headers['X-SQL-Query-Count'] = str(request_query_count())
+
+        if 'request_start_time' not in g or request.endpoint == 'metrics':
+            return response
+
+        latency = time.perf_counter() - g.request_start_time
+        endpoint = request.endpoint or 'unmatched'
+        metrics.observe(
+            endpoint, request.method, response.status_code, latency,
+            g.sql_statement_count, g.sql_time, g.serialization_time
+        )
+
+        threshold_ms = app.config.get('SLOW_REQUEST_THRESHOLD_MS')
+        if threshold_ms and latency * 1000 >= threshold_ms:
+            statements = "\n".join(
+                f"  {elapsed * 1000:.1f}ms  {statement}"
+                for elapsed, statement in sorted(g.get('sql_statements', []), reverse=True)
+            )
+            app.logger.warning(
+                f"Slow request {request.method} {request.path} ({endpoint}): {latency * 1000:.1f}ms, "
+                f"{g.sql_statement_count} SQL statements in {g.sql_time * 1000:.1f}ms, "
+                f"serialization {g.serialization_time * 1000:.1f}ms\n{statements}"
+            )
+        return response
+
+    @app.route('/metrics', methods=['GET'], endpoint='metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
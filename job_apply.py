@@ -0,0 +1,88 @@
+from datetime import datetime
+from sqlalchemy import select, literal
+from backend.models import db, Application, Job
+from backend.db_compat import insert_ignore, supports_returning
+from backend.application_stats import record_applications
+from backend.task_queue import enqueue
+
+MAX_BULK_APPLY = 50
+
+APPLICATION_COLUMNS = ['worker_id', 'job_id', 'status', 'applied_on']
+
+
+def parse_job_ids(data, limit=MAX_BULK_APPLY):
+    """Read {"job_ids": [...]}; returns unique ints in order. Raises ValueError."""
+    job_ids = (data or {}).get('job_ids')
+    if not isinstance(job_ids, list) or not job_ids:
+        raise ValueError("job_ids must be a non-empty list")
+    try:
+        job_ids = list(dict.fromkeys(int(job_id) for job_id in job_ids))
+    except (TypeError, ValueError):
+        raise ValueError("job_ids must be integers")
+    if len(job_ids) > limit:
+        raise ValueError(f"At most {limit} jobs can be applied to at once")
+    return job_ids
+
+
+class ApplyResult:
+    def __init__(self):
+        self.applied = []
+        self.already_applied = []
+        self.not_found = []
+
+    def to_dict(self):
+        return {
+            "applied": self.applied,
+            "already_applied": self.already_applied,
+            "not_found": self.not_found
+        }
+
+
+def _insert(worker_id, job_ids, now):
+    # Selecting from job means a missing job inserts nothing, and the
+    # (worker_id, job_id) unique key turns a duplicate into a no-op, so
+    # concurrent clicks can't race a check-then-insert
+    rows = select(
+        literal(worker_id, db.Integer), Job.id, literal('pending', db.String), literal(now, db.DateTime)
+    ).where(Job.id.in_(job_ids))
+    return insert_ignore(Application, APPLICATION_COLUMNS, rows, ['worker_id', 'job_id'])
+
+
+def apply_to_jobs(worker_id, job_ids, now=None):
+    """Apply `worker_id` to every job in `job_ids` inside the caller's transaction.
+
+    The happy path never reads before writing: one INSERT ... SELECT creates
+    the applications, then the funnel counters and notification tasks are
+    written in bulk. The caller commits.
+    """
+    now = now or datetime.utcnow()
+    worker_id = int(worker_id)
+    result = ApplyResult()
+
+    if supports_returning():
+        rows = db.session.execute(_insert(worker_id, job_ids, now).returning(Application.id, Application.job_id)).all()
+    else:
+        # No RETURNING on MySQL: one INSERT IGNORE per job gives each new id
+        rows = []
+        for job_id in job_ids:
+            cursor = db.session.execute(_insert(worker_id, [job_id], now))
+            if cursor.rowcount:
+                rows.append((cursor.lastrowid, job_id))
+
+    applied = {job_id: application_id for application_id, job_id in rows}
+    if applied:
+        record_applications(list(applied))
+        for application_id in applied.values():
+            enqueue('notify_employer_of_application', {'application_id': application_id})
+
+    skipped = [job_id for job_id in job_ids if job_id not in applied]
+    # Only the failures pay for telling a missing job from a repeat application
+    existing = {row.id for row in Job.query.with_entities(Job.id).filter(Job.id.in_(skipped))} if skipped else set()
+    for job_id in job_ids:
+        if job_id in applied:
+            result.applied.append(job_id)
+        elif job_id in existing:
+            result.already_applied.append(job_id)
+        else:
+            result.not_found.append(job_id)
+    return result
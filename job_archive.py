@@ -0,0 +1,157 @@
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, func, literal
+from backend.models import (
+    db, Job, Application, JobMatch, JobApplicationStats, ArchivedJob, ArchivedApplication, job_skill
+)
+from backend.recommendations import job_index
+from backend.search_index import search_index
+from backend.response_cache import invalidate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_GRACE_DAYS = 30
+# Breather between batches so replicas and live traffic keep up during a large backlog
+DEFAULT_BATCH_PAUSE_SECONDS = 0.05
+
+JOB_COLUMNS = ['id', 'title', 'salary_min', 'salary_max', 'salary_type', 'posted_date', 'employer_id',
+               'job_type', 'deadline_date', 'city', 'state', 'latitude', 'longitude']
+APPLICATION_COLUMNS = ['id', 'worker_id', 'job_id', 'status', 'applied_on']
+FUNNEL_COLUMNS = ['total', 'pending', 'accepted', 'rejected']
+
+# Rows pointing at a job that must go before the job itself
+DEPENDENT_TABLES = (
+    (Application.__table__, 'job_id'),
+    (JobMatch.__table__, 'job_id'),
+    (JobApplicationStats.__table__, 'job_id'),
+    (job_skill, 'job_id'),
+)
+
+
+def _due_job_ids(cutoff, batch_size):
+    # Served by ix_job_deadline_date_posted_date_id; SKIP LOCKED lets several
+    # sweepers run at once without archiving the same rows twice
+    rows = (
+        db.session.query(Job.id)
+        .filter(Job.deadline_date < cutoff)
+        .order_by(Job.deadline_date, Job.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    return [row.id for row in rows]
+
+
+def _archive_batch(job_ids, now):
+    job = Job.__table__
+    stats = JobApplicationStats.__table__
+    jobs = (
+        select(
+            *[job.c[column] for column in JOB_COLUMNS],
+            *[func.coalesce(stats.c[column], 0) for column in FUNNEL_COLUMNS],
+            literal(now, db.DateTime)
+        )
+        .select_from(job.outerjoin(stats, stats.c.job_id == job.c.id))
+        .where(job.c.id.in_(job_ids))
+    )
+    db.session.execute(insert(ArchivedJob).from_select(
+        JOB_COLUMNS + [f'applications_{column}' for column in FUNNEL_COLUMNS] + ['archived_at'], jobs
+    ))
+
+    application = Application.__table__
+    applications = (
+        select(*[application.c[column] for column in APPLICATION_COLUMNS], literal(now, db.DateTime))
+        .where(application.c.job_id.in_(job_ids))
+    )
+    db.session.execute(insert(ArchivedApplication).from_select(APPLICATION_COLUMNS + ['archived_at'], applications))
+
+    for table, column in DEPENDENT_TABLES:
+        db.session.execute(table.delete().where(table.c[column].in_(job_ids)))
+    db.session.execute(job.delete().where(job.c.id.in_(job_ids)))
+
+
+def archive_expired_jobs(grace_days=DEFAULT_GRACE_DAYS, batch_size=DEFAULT_BATCH_SIZE,
+                         pause=DEFAULT_BATCH_PAUSE_SECONDS, max_batches=None, now=None):
+    """Move jobs whose deadline passed more than `grace_days` ago, with their applications, to the archive.
+
+    Each batch is its own short transaction built from set-based
+    INSERT ... SELECT and DELETE statements, so locks are held for one
+    batch at a time and an interrupted sweep simply resumes next run.
+    Returns the number of jobs archived.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=grace_days)
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        job_ids = _due_job_ids(cutoff, batch_size)
+        if not job_ids:
+            db.session.rollback()
+            break
+        try:
+            _archive_batch(job_ids, now)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        # Other processes drop these lazily: their recommendation indexes skip
+        # expired jobs and their search indexes prune missing rows on catch-up
+        for job_id in job_ids:
+            job_index.remove_job(job_id)
+            search_index.remove('job', job_id)
+        archived += len(job_ids)
+        batches += 1
+        if len(job_ids) < batch_size:
+            break
+        time.sleep(pause)
+
+    if archived:
+        invalidate('jobs')
+    return archived
+
+
+def archive_settings(config):
+    return {
+        'grace_days': config.get('JOB_ARCHIVE_GRACE_DAYS', DEFAULT_GRACE_DAYS),
+        'batch_size': config.get('JOB_ARCHIVE_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+    }
+
+
+class ArchiveScheduler(threading.Thread):
+    """Runs archive_expired_jobs every `interval` seconds in a background thread."""
+
+    def __init__(self, app, interval):
+        super().__init__(name='job-archive-scheduler', daemon=True)
+        self.app = app
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            with self.app.app_context():
+                try:
+                    archived = archive_expired_jobs(**archive_settings(self.app.config))
+                    if archived:
+                        logger.info(f"Archived {archived} expired jobs")
+                except Exception:
+                    logger.exception("Expired job sweep failed")
+                finally:
+                    db.session.remove()
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        self._stopped.set()
+
+
+def start_archive_scheduler(app):
+    """Start the sweeper thread if JOB_ARCHIVE_INTERVAL_SECONDS is set; returns it (or None)."""
+    interval = app.config.get('JOB_ARCHIVE_INTERVAL_SECONDS', 0)
+    if not interval:
+        return None
+    scheduler = ArchiveScheduler(app, interval)
+    scheduler.start()
+    return scheduler
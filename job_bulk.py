@@ -0,0 +1,225 @@
+import csv
+import io
+import json
+import codecs
+from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
+from backend.models import db, Job, Application, job_skill
+from backend.db_compat import supports_returning
+from backend.skills import split_names, resolve_ids, extract_skill_ids
+from backend.task_queue import enqueue_many
+from backend.recommendations import job_index
+from backend.search_index import search_index
+from backend import job_feed
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+JOB_EXPORT_FIELDS = ['id', 'title', 'salary_min', 'salary_max', 'salary_type',
+                     'job_type', 'posted_date', 'deadline_date', 'employer_id']
+APPLICATION_EXPORT_FIELDS = ['id', 'job_id', 'worker_id', 'status', 'applied_on']
+
+# Follow-up work queued for every new posting, as POST /jobs/post does
+JOB_TASKS = ('match_job_to_workers', 'update_job_matches')
+
+
+def _optional_int(value, field):
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer")
+
+
+def job_fields(data, employer_id):
+    """Validate a job definition and return the column values for a Job row.
+
+    Shared by POST /jobs/post and the bulk importer so both apply the same
+    rules; raises ValueError with a client-facing message.
+    """
+    if data is not None and not isinstance(data, dict):
+        raise ValueError("Job must be a JSON object")
+    if not data or not data.get('title'):
+        raise ValueError("Missing required field: title")
+    deadline = data.get('deadline_date')
+    try:
+        deadline_date = datetime.strptime(deadline, '%Y-%m-%d') if deadline else None
+    except ValueError:
+        raise ValueError("deadline_date must be in YYYY-MM-DD format")
+    return {
+        'title': data['title'],
+        'salary_min': _optional_int(data.get('salary_min'), 'salary_min'),
+        'salary_max': _optional_int(data.get('salary_max'), 'salary_max'),
+        'salary_type': data.get('salary_type') or 'yearly',
+        'employer_id': employer_id,
+        'job_type': data.get('job_type') or 'full-time',
+        'deadline_date': deadline_date
+    }
+
+
+def iter_records(stream, fmt):
+    """Yield (row_number, dict) from a binary stream without reading it whole."""
+    lines = codecs.getreader('utf-8')(stream)
+    if fmt == 'csv':
+        for row_number, row in enumerate(csv.DictReader(lines), start=1):
+            yield row_number, row
+    elif fmt == 'ndjson':
+        for row_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield row_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, e
+    else:
+        raise ValueError("format must be 'csv' or 'ndjson'")
+
+
+class ImportResult:
+    def __init__(self):
+        self.inserted = 0
+        self.error_count = 0
+        self.errors = []
+        # Ids of the committed rows, for the post-commit hooks (announce_jobs)
+        self.job_ids = []
+
+    def add_error(self, row_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "error": message})
+
+    def to_dict(self):
+        return {
+            "inserted": self.inserted,
+            "error_count": self.error_count,
+            "errors": self.errors
+        }
+
+
+def _insert_chunk(chunk):
+    """Insert jobs with their skill tags and follow-up tasks; returns the new ids."""
+    table = Job.__table__
+    rows = [values for _, values, _ in chunk]
+    if supports_returning():
+        # executemany over one INSERT, ids returned in row order
+        ids = list(db.session.execute(
+            table.insert().returning(table.c.id, sort_by_parameter_order=True), rows
+        ).scalars())
+    else:
+        # MySQL can't return ids from a multi-row INSERT
+        ids = [db.session.execute(table.insert(), values).inserted_primary_key[0] for values in rows]
+
+    # Explicit skills if given, otherwise the ones named in the title (as set_job_skills)
+    tags = [
+        {'job_id': job_id, 'skill_id': skill_id}
+        for job_id, (_, values, skills) in zip(ids, chunk)
+        for skill_id in (resolve_ids(split_names(skills), create=True) if skills else extract_skill_ids(values['title']))
+    ]
+    if tags:
+        db.session.execute(job_skill.insert(), tags)
+    for name in JOB_TASKS:
+        enqueue_many(name, [{'job_id': job_id} for job_id in ids])
+    return ids
+
+
+def _flush(chunk, result):
+    if not chunk:
+        return
+    try:
+        ids = _insert_chunk(chunk)
+        db.session.commit()
+        result.inserted += len(ids)
+        result.job_ids.extend(ids)
+    except SQLAlchemyError:
+        db.session.rollback()
+        # Retry row by row so a single bad row doesn't sink the whole chunk
+        for item in chunk:
+            try:
+                ids = _insert_chunk([item])
+                db.session.commit()
+                result.inserted += 1
+                result.job_ids.extend(ids)
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                result.add_error(item[0], str(e.orig if hasattr(e, 'orig') else e))
+
+
+def import_jobs(records, employer_id, chunk_size=DEFAULT_CHUNK_SIZE, defaults=None):
+    """Validate and insert jobs in chunked transactions; returns an ImportResult.
+
+    `defaults` holds extra column values applied to every row, such as the
+    employer's location columns.
+    """
+    result = ImportResult()
+    chunk = []
+    for row_number, data in records:
+        if isinstance(data, Exception):
+            result.add_error(row_number, f"Invalid JSON: {data}")
+            continue
+        try:
+            values = dict(defaults or {}, **job_fields(data, employer_id))
+            chunk.append((row_number, values, data.get('skills')))
+        except ValueError as e:
+            result.add_error(row_number, str(e))
+            continue
+        if len(chunk) >= chunk_size:
+            _flush(chunk, result)
+            chunk = []
+    _flush(chunk, result)
+    return result
+
+
+def announce_jobs(job_ids, batch_size=DEFAULT_CHUNK_SIZE):
+    """Post-commit side effects of new postings: the in-process indexes and the live feed."""
+    for start in range(0, len(job_ids), batch_size):
+        jobs = (
+            Job.query
+            .options(selectinload(Job.skill_tags))
+            .filter(Job.id.in_(job_ids[start:start + batch_size]))
+            .order_by(Job.id)
+            .all()
+        )
+        for job in jobs:
+            job_index.add_job(job)
+            search_index.index('job', job)
+            job_feed.publish(job_feed.job_event(job))
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def _export_rows(query, fields, fmt):
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield buffer.getvalue()
+        for row in query.yield_per(1000):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow([_format_value(getattr(row, field)) for field in fields])
+            yield buffer.getvalue()
+    else:
+        for row in query.yield_per(1000):
+            yield json.dumps({field: _format_value(getattr(row, field)) for field in fields}) + "\n"
+
+
+def export_jobs(employer_id, fmt):
+    query = Job.query.filter_by(employer_id=employer_id).order_by(Job.id)
+    return _export_rows(query, JOB_EXPORT_FIELDS, fmt)
+
+
+def export_applications(employer_id, fmt):
+    query = (
+        Application.query
+        .join(Job, Application.job_id == Job.id)
+        .filter(Job.employer_id == employer_id)
+        .order_by(Application.id)
+    )
+    return _export_rows(query, APPLICATION_EXPORT_FIELDS, fmt)
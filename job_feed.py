@@ -0,0 +1,237 @@
+import json
+import queue
+import logging
+import threading
+import time
+from datetime import timedelta
+from flask import current_app
+from flask_jwt_extended import create_access_token
+from backend import redis_client
+from backend.geo import haversine_km
+from backend.serialization import dumps
+from backend.rate_limit import ConcurrencyLimiter
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'jobs:new'
+DEFAULT_HEARTBEAT_SECONDS = 15
+# Half of gunicorn's default 4 threads; each gthread stream pins one
+DEFAULT_MAX_CONNECTIONS = 2
+# Events buffered per subscriber; a client this far behind is disconnected
+# and catches up through Last-Event-ID on reconnect
+SUBSCRIBER_QUEUE_SIZE = 100
+# Jobs replayed at most when a client resumes with Last-Event-ID
+REPLAY_LIMIT = 100
+# Client reconnect delay sent in the stream's retry field
+RETRY_MILLISECONDS = 5000
+
+# EventSource can't send headers, so browsers connect with a ticket in the
+# query string instead of their access token: it ends up in access logs, so
+# it only opens the stream and expires before it is worth stealing
+TICKET_SCOPE = 'stream'
+DEFAULT_TICKET_SECONDS = 30
+
+
+def job_event(job):
+    """Event payload for a newly posted job; build it before commit so nothing is reloaded."""
+    return {
+        "id": job.id,
+        "job": job.to_dict(),
+        "skill_ids": [skill.id for skill in job.skill_tags],
+        "latitude": job.latitude,
+        "longitude": job.longitude,
+    }
+
+
+def issue_ticket(identity):
+    seconds = current_app.config.get('JOB_STREAM_TICKET_SECONDS', DEFAULT_TICKET_SECONDS)
+    return create_access_token(
+        identity=identity, expires_delta=timedelta(seconds=seconds), additional_claims={"scope": TICKET_SCOPE}
+    )
+
+
+def is_ticket(claims):
+    return claims.get("scope") == TICKET_SCOPE
+
+
+def format_event(event):
+    return b"id: %d\nevent: job\ndata: %s\n\n" % (event["id"], dumps(event["job"]))
+
+
+class Subscription:
+    """One open stream: its filters and a bounded queue of matching events."""
+
+    def __init__(self, skill_ids=None, near=None, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.skill_ids = set(skill_ids) if skill_ids is not None else None
+        self.near = near
+        self.queue = queue.Queue(maxsize)
+        self.overflowed = False
+
+    def matches(self, event):
+        if self.skill_ids is not None and not self.skill_ids.intersection(event["skill_ids"]):
+            return False
+        if self.near:
+            latitude, longitude, radius_km = self.near
+            if event["latitude"] is None or event["longitude"] is None:
+                return False
+            if haversine_km(latitude, longitude, event["latitude"], event["longitude"]) > radius_km:
+                return False
+        return True
+
+    def offer(self, event):
+        if not self.matches(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+
+class MemoryBroker:
+    """In-process fan-out; only streams served by the publishing process see the event."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+
+    def subscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.add(subscription)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event):
+        self._fan_out(event)
+
+    def _fan_out(self, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.offer(event)
+
+
+class RedisBroker(MemoryBroker):
+    """Events go through a Redis-protocol channel so every worker process sees them.
+
+    Each process keeps a single channel subscription, started with its
+    first stream, and fans messages out to its local subscribers.
+    """
+
+    def __init__(self, client=None, url=None, channel=CHANNEL):
+        super().__init__()
+        self.client = client or redis_client.connect(url)
+        self.channel = channel
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def publish(self, event):
+        self.client.publish(self.channel, dumps(event))
+
+    def subscribe(self, subscription):
+        super().subscribe(subscription)
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='job-feed-listener', daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message and message.get('type') == 'message':
+                        self._fan_out(json.loads(message['data']))
+            except Exception as e:
+                # Streams stay open; clients fill any gap via Last-Event-ID
+                logger.warning(f"Job feed subscription lost, reconnecting: {e}")
+                time.sleep(1)
+
+
+_broker = MemoryBroker()
+_limiter = ConcurrencyLimiter(DEFAULT_MAX_CONNECTIONS)
+_heartbeat_seconds = DEFAULT_HEARTBEAT_SECONDS
+
+
+def get_broker():
+    return _broker
+
+
+def set_broker(broker):
+    global _broker
+    _broker = broker
+
+
+def init_job_feed(app):
+    global _limiter, _heartbeat_seconds
+    if app.config.get('JOB_STREAM_BACKEND', 'memory') == 'redis':
+        set_broker(RedisBroker(url=app.config['JOB_STREAM_REDIS_URL']))
+    else:
+        set_broker(MemoryBroker())
+    _limiter = ConcurrencyLimiter(app.config.get('JOB_STREAM_MAX_CONNECTIONS', DEFAULT_MAX_CONNECTIONS))
+    _heartbeat_seconds = app.config.get('JOB_STREAM_HEARTBEAT_SECONDS', DEFAULT_HEARTBEAT_SECONDS)
+
+
+def publish(event):
+    """Push a committed job to subscribers; a broker outage never fails the posting."""
+    try:
+        _broker.publish(event)
+    except Exception as e:
+        logger.warning(f"Job feed publish failed: {e}")
+
+
+class EventStream:
+    """SSE body for one subscription; releases its slot when iteration ends or the server closes it."""
+
+    def __init__(self, subscription, replay, broker, limiter, heartbeat):
+        self.subscription = subscription
+        self.replay = replay
+        self.broker = broker
+        self.limiter = limiter
+        self.heartbeat = heartbeat
+        self._closed = False
+
+    def __iter__(self):
+        try:
+            yield b"retry: %d\n\n" % RETRY_MILLISECONDS
+            last_id = 0
+            for event in self.replay:
+                last_id = max(last_id, event["id"])
+                yield format_event(event)
+            while not self.subscription.overflowed:
+                try:
+                    event = self.subscription.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    # Comment line: keeps proxies from timing the connection out
+                    yield b": keepalive\n\n"
+                    continue
+                if event["id"] > last_id:
+                    yield format_event(event)
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.broker.unsubscribe(self.subscription)
+            self.limiter.release()
+
+
+def open_stream(subscription, load_replay=None):
+    """Reserve a connection slot and subscribe; returns an EventStream, or None at capacity.
+
+    `load_replay` (jobs after Last-Event-ID) runs after subscribing, so
+    nothing posted in between is missed; duplicates are skipped by id.
+    """
+    if not _limiter.acquire():
+        return None
+    _broker.subscribe(subscription)
+    stream = EventStream(subscription, [], _broker, _limiter, _heartbeat_seconds)
+    try:
+        stream.replay = list(load_replay()) if load_replay else []
+    except Exception:
+        stream.close()
+        raise
+    return stream
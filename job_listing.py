@@ -0,0 +1,129 @@
+import base64
+from datetime import datetime
+from sqlalchemy import and_, or_
+from backend.models import Job
+from backend.geo import parse_near, filter_near, nearest
+from backend.skills import parse_skill_filter, filter_jobs_by_skills
+from backend.serialization import job_schema
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+CURSOR_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def encode_cursor(job):
+    raw = f"{job.posted_date.strftime(CURSOR_DATE_FORMAT)}|{job.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        posted, job_id = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.strptime(posted, CURSOR_DATE_FORMAT), int(job_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def _parse_bool(value):
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def parse_job_filters(args):
+    """Read listing filters from request args; raises ValueError on bad input."""
+    filters = {
+        'job_type': args.get('job_type'),
+        'salary_type': args.get('salary_type'),
+        'salary_min': None,
+        'salary_max': None,
+        'open': _parse_bool(args.get('open', 'false')),
+    }
+    for key in ('salary_min', 'salary_max'):
+        if args.get(key):
+            try:
+                filters[key] = int(args[key])
+            except ValueError:
+                raise ValueError(f"{key} must be an integer")
+
+    limit = args.get('limit', DEFAULT_PAGE_SIZE)
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    filters['limit'] = max(1, min(limit, MAX_PAGE_SIZE))
+
+    cursor = args.get('cursor')
+    filters['cursor'] = decode_cursor(cursor) if cursor else None
+    filters['near'] = parse_near(args)
+    filters['skills'] = parse_skill_filter(args)
+    return filters
+
+
+def apply_job_filters(query, filters, now=None, model=Job):
+    """Apply parsed listing filters to a query over `model`.
+
+    `model` may be ArchivedJob for the column filters; near and skills need
+    the live job's geohash and skill index, so callers must reject them there.
+    """
+    # Each filter is an equality/range on a column led by the composite
+    # indexes declared on Job, so the planner never falls back to a scan
+    if filters.get('job_type'):
+        query = query.filter(model.job_type == filters['job_type'])
+    if filters.get('salary_type'):
+        query = query.filter(model.salary_type == filters['salary_type'])
+    if filters.get('salary_min') is not None:
+        # Jobs whose top of range reaches the requested minimum
+        query = query.filter(model.salary_max >= filters['salary_min'])
+    if filters.get('salary_max') is not None:
+        query = query.filter(model.salary_min <= filters['salary_max'])
+    if filters.get('open'):
+        now = now or datetime.utcnow()
+        query = query.filter(or_(model.deadline_date.is_(None), model.deadline_date >= now))
+    if filters.get('near'):
+        query = filter_near(query, Job, filters['near'])
+    if filters.get('skills'):
+        query = filter_jobs_by_skills(query, *filters['skills'])
+    return query
+
+
+def paginate_jobs(query, filters, model=Job):
+    """Return (jobs, next_cursor) for one keyset page ordered newest first.
+
+    `model` may be ArchivedJob, which shares the (posted_date, id) sort keys.
+    """
+    if filters.get('cursor'):
+        posted, job_id = filters['cursor']
+        query = query.filter(or_(
+            model.posted_date < posted,
+            and_(model.posted_date == posted, model.id < job_id)
+        ))
+
+    limit = filters['limit']
+    jobs = query.order_by(model.posted_date.desc(), model.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = encode_cursor(jobs[-1])
+    return jobs, next_cursor
+
+
+def list_jobs_page(args):
+    filters = parse_job_filters(args)
+    encode = job_schema.encoder(args)
+    query = apply_job_filters(Job.query, filters)
+
+    if filters['near']:
+        # Distance-sorted results are a single bounded page
+        return {
+            "jobs": [dict(encode(job), distance_km=round(distance, 2))
+                     for job, distance in nearest(query, Job, filters['near'], filters['limit'])],
+            "next_cursor": None
+        }
+
+    jobs, next_cursor = paginate_jobs(query, filters)
+    return {
+        "jobs": [encode(job) for job in jobs],
+        "next_cursor": next_cursor
+    }
@@ -1,13 +1,28 @@
-from flask import Blueprint, request, jsonify
-from backend.models import Job, Worker, db
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from sqlalchemy.orm import selectinload
+from backend.models import Job, Worker, JobMatch, ArchivedJob, ArchivedApplication, db
+from backend.job_listing import list_jobs_page, parse_job_filters, apply_job_filters, paginate_jobs
+from backend.streaming import wants_stream, stream_query
+from backend.serialization import job_schema, archived_job_schema, respond
+from backend.geo import location_columns, parse_near
+from backend.task_queue import enqueue
+from backend.skills import set_job_skills, split_names, resolve_ids
+from backend.recommendations import job_index, recommend_for_worker, DEFAULT_LIMIT
+from backend.matching import FOR_JOB, FOR_WORKER
+from backend.search_index import search_index
+from backend.response_cache import cached_response, invalidate
+from backend.rate_limit import rate_limit, long_lived
+from backend import job_feed
+from backend.job_bulk import job_fields, iter_records, import_jobs, announce_jobs, export_jobs, export_applications
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, get_jwt_request_location, current_user
 from flask_cors import cross_origin
-from datetime import datetime
 
 jobs_bp = Blueprint('jobs', __name__)
 
 @jobs_bp.route('/', methods=['GET', 'OPTIONS'])
+@rate_limit('120/minute')
 @cross_origin(supports_credentials=True)
+@cached_response('jobs')
 def list_jobs():
     if request.method == 'OPTIONS':
         response = jsonify({'message': 'OK'})
@@ -16,9 +31,16 @@ def list_jobs():
         response.headers.add('Access-Control-Allow-Methods', 'GET')
         return response
 
+    # Supports ?limit=&cursor= keyset paging plus job_type, salary_type,
+    # salary_min, salary_max and open=true filters; ?fields=id,title trims each job
     try:
-        jobs = Job.query.all()
-        return jsonify([job.to_dict() for job in jobs]), 200
+        if wants_stream():
+            # Stream every matching job instead of one page
+            query = apply_job_filters(Job.query, parse_job_filters(request.args))
+            return stream_query(query.order_by(Job.posted_date.desc(), Job.id.desc()), job_schema.encoder(request.args))
+        return respond(list_jobs_page(request.args))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -35,25 +57,31 @@ def post_job():
 
     try:
         data = request.get_json()
-        new_job = Job(
-            title=data['title'],
-            salary_min=data.get('salary_min'),
-            salary_max=data.get('salary_max'),
-            salary_type=data.get('salary_type', 'yearly'),
-            employer_id=get_jwt_identity(),
-            job_type=data.get('job_type', 'full-time'),
-            deadline_date=datetime.strptime(data['deadline_date'], '%Y-%m-%d') if data.get('deadline_date') else None
-        )
+        employer = current_user.employer if current_user else None
+        new_job = Job(**job_fields(data, get_jwt_identity()), **location_columns(employer))
+        # Explicit skills if given, otherwise the ones named in the title
+        set_job_skills(new_job, data.get('skills'))
         db.session.add(new_job)
+        db.session.flush()
+        # Matching the posting against workers happens in the task worker
+        enqueue('match_job_to_workers', {'job_id': new_job.id})
+        enqueue('update_job_matches', {'job_id': new_job.id})
+        event = job_feed.job_event(new_job)
         db.session.commit()
+        job_index.add_job(new_job)
+        search_index.index('job', new_job)
+        invalidate('jobs')
+        job_feed.publish(event)
         return jsonify(new_job.to_dict()), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 400
 
 @jobs_bp.route('/recommendations', methods=['GET', 'OPTIONS'])
+@rate_limit('60/minute')
 @cross_origin(supports_credentials=True)
 @jwt_required()
+@cached_response('jobs', 'worker:{user}')
 def recommend_jobs():
     if request.method == 'OPTIONS':
         response = jsonify({'message': 'OK'})
@@ -63,12 +91,196 @@ def recommend_jobs():
         return response
 
     try:
-        # Get current user
-        user_id = get_jwt_identity()
-        
-        # For now, return all jobs
-        # In future, implement recommendation logic based on worker's skills and preferences
-        jobs = Job.query.all()
-        return jsonify([job.to_dict() for job in jobs]), 200
+        # Rank jobs against the current worker's skills, titles and desired salary
+        worker = current_user.worker if current_user else None
+        limit = request.args.get('limit', DEFAULT_LIMIT, type=int)
+        encode = job_schema.encoder(request.args)
+
+        recommendations = recommend_for_worker(worker, limit)
+        return respond([dict(encode(job), match_score=round(score, 4)) for job, score in recommendations])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+def _stream_subscription():
+    # ?skills= overrides the worker's own skills and job titles; ?all=true
+    # follows every posting. ?near=&radius_km= narrows by location.
+    near = parse_near(request.args)
+    if request.args.get('all', '').lower() in ('1', 'true', 'yes'):
+        return job_feed.Subscription(near=near)
+    if request.args.get('skills'):
+        return job_feed.Subscription(resolve_ids(split_names(request.args['skills'])), near)
+    worker = current_user.worker if current_user else None
+    if worker is None:
+        return job_feed.Subscription(near=near)
+    skill_ids = {skill.id for skill in worker.skill_tags} | {skill.id for skill in worker.job_title_tags}
+    return job_feed.Subscription(skill_ids or None, near)
+
+# Short-lived credential for opening /jobs/stream from a browser
+@jobs_bp.route('/stream/ticket', methods=['POST'])
+@rate_limit('30/minute')
+@jwt_required()
+def stream_ticket():
+    return jsonify({"ticket": job_feed.issue_ticket(get_jwt_identity())}), 201
+
+# Server-sent events with each newly posted job matching the subscriber.
+# EventSource can't send headers, so browsers pass a stream ticket as ?ticket=
+@jobs_bp.route('/stream', methods=['GET'])
+@long_lived
+@jwt_required(locations=['headers', 'query_string'])
+def stream_jobs():
+    if get_jwt_request_location() == 'query_string' and not job_feed.is_ticket(get_jwt()):
+        return jsonify({"error": "Pass a stream ticket, not an access token, in the query string"}), 401
+    try:
+        subscription = _stream_subscription()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+
+    def load_replay():
+        # Jobs posted while the client was disconnected (ids are the event ids)
+        if not last_event_id or not last_event_id.isdigit():
+            return []
+        jobs = (
+            Job.query
+            .options(selectinload(Job.skill_tags))
+            .filter(Job.id > int(last_event_id))
+            .order_by(Job.id)
+            .limit(job_feed.REPLAY_LIMIT)
+            .all()
+        )
+        return [event for event in map(job_feed.job_event, jobs) if subscription.matches(event)]
+
+    stream = job_feed.open_stream(subscription, load_replay)
+    if stream is None:
+        response = jsonify({"error": "Too many open job streams, please retry shortly"})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(job_feed.RETRY_MILLISECONDS // 1000)
+        return response
+
+    # Not wrapped in stream_with_context: the request (and its DB
+    # connection) is released as soon as the stream starts
+    response = Response(stream, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+def _request_format():
+    fmt = request.args.get('format')
+    if fmt:
+        return fmt
+    return 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+
+# Bulk import: stream a CSV or NDJSON body of job definitions
+@jobs_bp.route('/bulk', methods=['POST'])
+@rate_limit('5/minute')
+@jwt_required()
+def bulk_import_jobs():
+    fmt = _request_format()
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({"error": "format must be 'csv' or 'ndjson'"}), 400
+
+    chunk_size = max(1, min(request.args.get('chunk_size', 1000, type=int), 5000))
+    try:
+        employer = current_user.employer if current_user else None
+        result = import_jobs(iter_records(request.stream, fmt), get_jwt_identity(), chunk_size,
+                             location_columns(employer))
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+
+    if result.inserted:
+        invalidate('jobs')
+        announce_jobs(result.job_ids)
+    return jsonify(result.to_dict()), 201 if result.inserted else 400
+
+# Streaming export of the current employer's jobs or their applications
+@jobs_bp.route('/export', methods=['GET'])
+@rate_limit('10/minute')
+@jwt_required()
+def export_employer_jobs():
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({"error": "format must be 'csv' or 'ndjson'"}), 400
+
+    employer_id = get_jwt_identity()
+    if request.args.get('include') == 'applications':
+        rows = export_applications(employer_id, fmt)
+    else:
+        rows = export_jobs(employer_id, fmt)
+    return Response(stream_with_context(rows), mimetype=EXPORT_MIMETYPES[fmt])
+
+# Precomputed candidates for one of the current employer's jobs, best first
+@jobs_bp.route('/<int:job_id>/candidates', methods=['GET'])
+@jwt_required()
+def job_candidates(job_id):
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if str(job.employer_id) != str(get_jwt_identity()):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    matches = (
+        db.session.query(JobMatch, Worker)
+        .join(Worker, JobMatch.worker_id == Worker.id)
+        .filter(JobMatch.job_id == job_id, JobMatch.direction == FOR_JOB)
+        .order_by(JobMatch.score.desc())
+        .limit(limit)
+        .all()
+    )
+    return jsonify([dict(worker.to_dict(), match_score=round(match.score, 4)) for match, worker in matches]), 200
+
+# Precomputed job matches for the current worker, best first
+@jobs_bp.route('/matches', methods=['GET'])
+@jwt_required()
+def worker_matches():
+    worker = current_user.worker if current_user else None
+    if not worker:
+        return jsonify({"error": "Worker profile not found"}), 404
+
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    matches = (
+        db.session.query(JobMatch, Job)
+        .join(Job, JobMatch.job_id == Job.id)
+        .filter(JobMatch.worker_id == worker.id, JobMatch.direction == FOR_WORKER)
+        .order_by(JobMatch.score.desc())
+        .limit(limit)
+        .all()
+    )
+    return jsonify([dict(job.to_dict(), match_score=round(match.score, 4)) for match, job in matches]), 200
+
+# The current employer's archived (expired) postings with their final
+# application counts, newest first; same ?limit=&cursor= paging as /jobs/
+@jobs_bp.route('/archived', methods=['GET'])
+@jwt_required()
+def archived_jobs():
+    try:
+        filters = parse_job_filters(request.args)
+        encode = archived_job_schema.encoder(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Archived rows keep no geohash and no skill tags
+    if filters['near'] or filters['skills']:
+        return jsonify({"error": "near and skills can't filter archived jobs"}), 400
+
+    query = apply_job_filters(ArchivedJob.query.filter_by(employer_id=get_jwt_identity()), filters, model=ArchivedJob)
+    jobs, next_cursor = paginate_jobs(query, filters, model=ArchivedJob)
+    return respond({"jobs": [encode(job) for job in jobs], "next_cursor": next_cursor})
+
+# Applications an archived job received
+@jobs_bp.route('/archived/<int:job_id>/applications', methods=['GET'])
+@jwt_required()
+def archived_job_applications(job_id):
+    job = db.session.get(ArchivedJob, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if str(job.employer_id) != str(get_jwt_identity()):
+        return jsonify({"error": "Unauthorized"}), 403
+
+    applications = ArchivedApplication.query.filter_by(job_id=job_id).order_by(ArchivedApplication.id).all()
+    return jsonify([application.to_dict() for application in applications]), 200
@@ -0,0 +1,223 @@
+import time
+import threading
+from datetime import datetime
+import numpy as np
+from sqlalchemy import or_
+from backend.models import db, Job, Worker, JobMatch
+from backend.recommendations import tokenize
+from backend.task_queue import task
+
+DEFAULT_TOP_N = 50
+
+# JobMatch.direction: whose top-N list a row belongs to
+FOR_JOB = 'job'
+FOR_WORKER = 'worker'
+
+# Score = weighted skill/title similarity + salary fit + experience
+SIMILARITY_WEIGHT = 0.6
+SALARY_WEIGHT = 0.25
+EXPERIENCE_WEIGHT = 0.15
+EXPERIENCE_CAP_YEARS = 10.0
+
+# How long a process reuses its encoded worker/job matrices
+MATRIX_TTL_SECONDS = 60
+
+
+def _worker_tokens(skills, preferred_job_titles):
+    tokens = set()
+    for field in (skills, preferred_job_titles):
+        for value in (field or "").split(","):
+            tokens |= tokenize(value)
+    return tokens
+
+
+class SparseMatrix:
+    """Rows of L2-normalized binary token vectors in CSR form.
+
+    Scoring a query vector against every row is a vectorized sparse
+    mat-vec: gather the query weights at each stored column and sum them
+    per row with np.add.reduceat.
+    """
+
+    def __init__(self, ids, token_rows, vocabulary):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        lengths = np.array([len(tokens) for tokens in token_rows], dtype=np.int64)
+        self.indptr = np.concatenate(([0], np.cumsum(lengths)))
+        self.indices = np.fromiter(
+            (vocabulary[token] for tokens in token_rows for token in tokens),
+            dtype=np.int64, count=int(self.indptr[-1])
+        )
+        norms = np.sqrt(np.maximum(lengths, 1)).astype(np.float32)
+        self.data = np.repeat(1.0 / norms, lengths).astype(np.float32)
+        self._nonempty = lengths > 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def dot(self, query):
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        if self.indices.size:
+            products = query[self.indices] * self.data
+            sums = np.add.reduceat(products, self.indptr[:-1][self._nonempty])
+            scores[self._nonempty] = sums
+        return scores
+
+
+class MatchEngine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built_at = 0.0
+        self.vocabulary = {}
+
+    def _encode_query(self, tokens):
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        known = [self.vocabulary[token] for token in tokens if token in self.vocabulary]
+        if known:
+            vector[known] = 1.0 / np.sqrt(len(known))
+        return vector
+
+    def _build(self):
+        now = datetime.utcnow()
+        worker_rows = Worker.query.with_entities(
+            Worker.id, Worker.skills, Worker.preferred_job_titles, Worker.desired_salary, Worker.years_experience
+        ).all()
+        job_rows = (
+            Job.query
+            .filter(or_(Job.deadline_date.is_(None), Job.deadline_date >= now))
+            .with_entities(Job.id, Job.title, Job.salary_min, Job.salary_max)
+            .all()
+        )
+
+        worker_tokens = [_worker_tokens(row.skills, row.preferred_job_titles) for row in worker_rows]
+        job_tokens = [tokenize(row.title) for row in job_rows]
+
+        vocabulary = {}
+        for tokens in worker_tokens + job_tokens:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+        self.vocabulary = vocabulary
+
+        self.workers = SparseMatrix([row.id for row in worker_rows], worker_tokens, vocabulary)
+        self.worker_salary = np.array([row.desired_salary or 0 for row in worker_rows], dtype=np.float32)
+        self.worker_experience = np.array(
+            [min((row.years_experience or 0) / EXPERIENCE_CAP_YEARS, 1.0) for row in worker_rows], dtype=np.float32
+        )
+
+        self.jobs = SparseMatrix([row.id for row in job_rows], job_tokens, vocabulary)
+        self.job_salary = np.array([row.salary_max or row.salary_min or 0 for row in job_rows], dtype=np.float32)
+
+    def ensure_built(self, force=False):
+        with self._lock:
+            if force or time.monotonic() - self._built_at > MATRIX_TTL_SECONDS:
+                self._build()
+                self._built_at = time.monotonic()
+
+    @staticmethod
+    def _salary_fit(offered, desired):
+        # 1 when the offer meets the ask, proportionally less below it, 0.5 if unknown
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fit = np.where((offered > 0) & (desired > 0), np.minimum(offered / desired, 1.0), 0.5)
+        return fit.astype(np.float32)
+
+    def _top(self, ids, scores, similarity, top_n):
+        # Only pairs that share at least one skill/title token are matches
+        candidates = np.flatnonzero(similarity > 0)
+        if candidates.size > top_n:
+            best = np.argpartition(scores[candidates], -top_n)[-top_n:]
+            candidates = candidates[best]
+        order = candidates[np.argsort(-scores[candidates])]
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+    def candidates_for_job(self, title, salary, top_n=DEFAULT_TOP_N):
+        """Rank all workers for a job; returns [(worker_id, score)] best first."""
+        similarity = self.workers.dot(self._encode_query(tokenize(title)))
+        scores = (
+            SIMILARITY_WEIGHT * similarity
+            + SALARY_WEIGHT * self._salary_fit(np.float32(salary or 0), self.worker_salary)
+            + EXPERIENCE_WEIGHT * self.worker_experience
+        )
+        return self._top(self.workers.ids, scores, similarity, top_n)
+
+    def jobs_for_worker(self, worker, top_n=DEFAULT_TOP_N):
+        """Rank all open jobs for a worker; returns [(job_id, score)] best first."""
+        similarity = self.jobs.dot(self._encode_query(_worker_tokens(worker.skills, worker.preferred_job_titles)))
+        experience = min((worker.years_experience or 0) / EXPERIENCE_CAP_YEARS, 1.0)
+        scores = (
+            SIMILARITY_WEIGHT * similarity
+            + SALARY_WEIGHT * self._salary_fit(self.job_salary, np.float32(worker.desired_salary or 0))
+            + EXPERIENCE_WEIGHT * experience
+        )
+        return self._top(self.jobs.ids, scores, similarity, top_n)
+
+
+engine = MatchEngine()
+
+
+def _replace(filter_column, key, direction, rows):
+    JobMatch.query.filter(filter_column == key, JobMatch.direction == direction).delete(synchronize_session=False)
+    if rows:
+        db.session.execute(JobMatch.__table__.insert(), rows)
+
+
+@task('update_job_matches')
+def update_job_matches(job_id, top_n=DEFAULT_TOP_N):
+    """Recompute the stored candidates for one job."""
+    job = db.session.get(Job, job_id)
+    if not job:
+        return 0
+    engine.ensure_built()
+    now = datetime.utcnow()
+    matches = engine.candidates_for_job(job.title, job.salary_max or job.salary_min, top_n)
+    _replace(JobMatch.job_id, job_id, FOR_JOB, [
+        {"job_id": job_id, "worker_id": worker_id, "direction": FOR_JOB, "score": score, "computed_at": now}
+        for worker_id, score in matches
+    ])
+    return len(matches)
+
+
+@task('update_worker_matches')
+def update_worker_matches(worker_id, top_n=DEFAULT_TOP_N):
+    """Recompute the stored job matches for one worker."""
+    worker = db.session.get(Worker, worker_id)
+    if not worker:
+        return 0
+    engine.ensure_built()
+    now = datetime.utcnow()
+    matches = engine.jobs_for_worker(worker, top_n)
+    _replace(JobMatch.worker_id, worker_id, FOR_WORKER, [
+        {"job_id": job_id, "worker_id": worker_id, "direction": FOR_WORKER, "score": score, "computed_at": now}
+        for job_id, score in matches
+    ])
+    return len(matches)
+
+
+def rebuild_all(top_n=DEFAULT_TOP_N, batch_size=500):
+    """Recompute the whole matrix: top-N workers per job and top-N jobs per worker."""
+    engine.ensure_built(force=True)
+    now = datetime.utcnow()
+    rows = []
+
+    for i, job_id in enumerate(engine.jobs.ids.tolist()):
+        start, end = engine.jobs.indptr[i], engine.jobs.indptr[i + 1]
+        query = np.zeros(len(engine.vocabulary), dtype=np.float32)
+        query[engine.jobs.indices[start:end]] = engine.jobs.data[start:end]
+        similarity = engine.workers.dot(query)
+        scores = (
+            SIMILARITY_WEIGHT * similarity
+            + SALARY_WEIGHT * engine._salary_fit(engine.job_salary[i], engine.worker_salary)
+            + EXPERIENCE_WEIGHT * engine.worker_experience
+        )
+        for worker_id, score in engine._top(engine.workers.ids, scores, similarity, top_n):
+            rows.append({"job_id": job_id, "worker_id": worker_id, "direction": FOR_JOB,
+                         "score": score, "computed_at": now})
+
+    for worker in Worker.query.yield_per(batch_size):
+        for job_id, score in engine.jobs_for_worker(worker, top_n):
+            rows.append({"job_id": job_id, "worker_id": worker.id, "direction": FOR_WORKER,
+                         "score": score, "computed_at": now})
+
+    JobMatch.query.delete(synchronize_session=False)
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(JobMatch.__table__.insert(), rows[start:start + batch_size])
+    db.session.commit()
+    return len(rows)
@@ -1,8 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
+import json
 from datetime import datetime
+from backend.instrumentation import timed_serialization
+from backend.serialization import user_schema, worker_schema, employer_schema, job_schema, archived_job_schema
+from backend.db_routing import RoutingSession
 
-db = SQLAlchemy()
+# Reads of GET requests may be routed to a replica; see db_routing.py
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     __tablename__ = 'user'
@@ -23,17 +28,8 @@ class User(db.Model):
     def check_password(self, password):
         return check_password_hash(self.password, password)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "email": self.email,
-            "location": self.location,
-            "skills": self.skills,
-            "company_name": self.company_name,
-            "worker": self.worker.to_dict() if self.worker else None,
-            "employer": self.employer.to_dict() if self.employer else None
-        }
+    def to_dict(self, fields=None):
+        return user_schema.encode(self, fields)
 
 class Worker(db.Model):
     __tablename__ = 'worker'
@@ -46,31 +42,29 @@ class Worker(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), unique=True, nullable=False)
     
     bio = db.Column(db.String(500), nullable=True)
+    # Bumped on every ORM or Core UPDATE; search indexes in other processes
+    # re-read rows changed since their last catch-up
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     profile_picture = db.Column(db.String(200), nullable=True)
     skills = db.Column(db.String(200), nullable=True)
     desired_salary = db.Column(db.Integer, nullable=True)
     preferred_job_titles = db.Column(db.String(200), nullable=True)
     join_date = db.Column(db.DateTime, default=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "age": self.age,
-            "years_experience": self.years_experience,
-            "contact_number": self.contact_number,
-            "email": self.email,
-            "user_id": self.user_id,
-            "bio": self.bio,
-            "profile_picture": self.profile_picture,
-            "skills": self.skills.split(",") if self.skills else [],
-            "desired_salary": self.desired_salary,
-            "preferred_job_titles": self.preferred_job_titles.split(",") if self.preferred_job_titles else [],
-            "location": {
-                "city": self.location.split(",")[0].strip() if self.location else None,
-                "state": self.location.split(",")[1].strip() if self.location and "," in self.location else None
-            } if self.location else None
-        }
+    # Normalized location, geocoded from the bundled gazetteer (see geo.py)
+    city = db.Column(db.String(100), nullable=True)
+    state = db.Column(db.String(100), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    geohash = db.Column(db.String(12), nullable=True, index=True)
+
+    # Normalized skills (see skills.py); the string columns above keep what
+    # the worker typed, for display
+    skill_tags = db.relationship('Skill', secondary='worker_skill')
+    job_title_tags = db.relationship('Skill', secondary='worker_job_title')
+
+    def to_dict(self, fields=None):
+        return worker_schema.encode(self, fields)
 
 class Employer(db.Model):
     __tablename__ = 'employer'
@@ -87,21 +81,19 @@ class Employer(db.Model):
     industry = db.Column(db.String(100), nullable=False)
     website = db.Column(db.String(100), nullable=True)
     description = db.Column(db.String(500), nullable=True)
+    # Bumped on every ORM or Core UPDATE; search indexes in other processes
+    # re-read rows changed since their last catch-up
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "company_name": self.company_name,
-            "contact_number": self.contact_number,
-            "email": self.email,
-            "user_id": self.user_id,
-            "address": {
-                "street": self.address.split(",")[0].strip() if self.address else None,
-                "city": self.address.split(",")[1].strip() if self.address and len(self.address.split(",")) > 1 else None,
-                "state": self.address.split(",")[2].strip() if self.address and len(self.address.split(",")) > 2 else None
-            } if self.address else None
-        }
+    # Normalized location, geocoded from the bundled gazetteer (see geo.py)
+    city = db.Column(db.String(100), nullable=True)
+    state = db.Column(db.String(100), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    geohash = db.Column(db.String(12), nullable=True, index=True)
+
+    def to_dict(self, fields=None):
+        return employer_schema.encode(self, fields)
 
 class Job(db.Model):
     __tablename__ = 'job'
@@ -115,35 +107,219 @@ class Job(db.Model):
     
     job_type = db.Column(db.String(50), nullable=False)
     deadline_date = db.Column(db.DateTime, nullable=True)
+    # Bumped on every ORM or Core UPDATE; search indexes in other processes
+    # re-read rows changed since their last catch-up
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    # Normalized location copied from the employer when the job is posted
+    city = db.Column(db.String(100), nullable=True)
+    state = db.Column(db.String(100), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    geohash = db.Column(db.String(12), nullable=True, index=True)
 
     employer = db.relationship('Employer', backref='jobs')
+    skill_tags = db.relationship('Skill', secondary='job_skill')
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "salary": {
-                "min": self.salary_min,
-                "max": self.salary_max,
-                "type": self.salary_type
-            },
-            "posted_date": self.posted_date.strftime('%Y-%m-%d %H:%M:%S'),
-            "employer_id": self.employer_id,
-            "job_type": self.job_type,
-            "deadline_date": self.deadline_date.strftime('%Y-%m-%d') if self.deadline_date else None
-        }
+    # Keyset pagination sorts on (posted_date, id); each listing filter gets
+    # a composite index that leads with the filtered column and ends with
+    # the sort keys so filtered pages are served straight from the index
+    __table_args__ = (
+        db.Index('ix_job_posted_date_id', 'posted_date', 'id'),
+        db.Index('ix_job_job_type_posted_date_id', 'job_type', 'posted_date', 'id'),
+        db.Index('ix_job_salary_type_posted_date_id', 'salary_type', 'posted_date', 'id'),
+        db.Index('ix_job_deadline_date_posted_date_id', 'deadline_date', 'posted_date', 'id'),
+        db.Index('ix_job_salary_max_salary_min', 'salary_max', 'salary_min'),
+    )
+
+    def to_dict(self, fields=None):
+        return job_schema.encode(self, fields)
 
 class Application(db.Model):
     __tablename__ = 'application'
     id = db.Column(db.Integer, primary_key=True)
     worker_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
     status = db.Column(db.String(20), default='pending')
+    applied_on = db.Column(db.DateTime, default=datetime.utcnow)
 
+    job = db.relationship('Job', backref='applications')
+
+    __table_args__ = (
+        # One application per worker and job; also serves the worker's "applied" lookups
+        db.UniqueConstraint('worker_id', 'job_id', name='uq_application_worker_job'),
+    )
+
+    @timed_serialization
     def to_dict(self):
         return {
             "id": self.id,
             "worker_id": self.worker_id,
             "job_id": self.job_id,
             "status": self.status
-        }
\ No newline at end of file
+        }
+
+class ArchivedJob(db.Model):
+    # Jobs moved out of `job` after their deadline by job_archive.py, so the
+    # live board only scans open postings; keeps the final application funnel
+    __tablename__ = 'archived_job'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(100))
+    salary_min = db.Column(db.Integer, nullable=True)
+    salary_max = db.Column(db.Integer, nullable=True)
+    salary_type = db.Column(db.String(50), nullable=False)
+    posted_date = db.Column(db.DateTime)
+    employer_id = db.Column(db.Integer, nullable=False)
+    job_type = db.Column(db.String(50), nullable=False)
+    deadline_date = db.Column(db.DateTime, nullable=True)
+    city = db.Column(db.String(100), nullable=True)
+    state = db.Column(db.String(100), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    applications_total = db.Column(db.Integer, nullable=False, default=0)
+    applications_pending = db.Column(db.Integer, nullable=False, default=0)
+    applications_accepted = db.Column(db.Integer, nullable=False, default=0)
+    applications_rejected = db.Column(db.Integer, nullable=False, default=0)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # An employer's history, newest first, with the same keyset paging as the live board
+        db.Index('ix_archived_job_employer_id_posted_date_id', 'employer_id', 'posted_date', 'id'),
+    )
+
+    def to_dict(self, fields=None):
+        return archived_job_schema.encode(self, fields)
+
+class ArchivedApplication(db.Model):
+    __tablename__ = 'archived_application'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    worker_id = db.Column(db.Integer, nullable=False, index=True)
+    job_id = db.Column(db.Integer, nullable=False, index=True)
+    status = db.Column(db.String(20))
+    applied_on = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "worker_id": self.worker_id,
+            "job_id": self.job_id,
+            "status": self.status,
+            "applied_on": self.applied_on.strftime('%Y-%m-%d') if self.applied_on else None
+        }
+
+class JobApplicationStats(db.Model):
+    # Per-job application funnel, maintained in the same transaction as
+    # every apply and status change; rebuilt by `flask reconcile-application-stats`
+    __tablename__ = 'job_application_stats'
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    employer_id = db.Column(db.Integer, nullable=False, index=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    accepted = db.Column(db.Integer, nullable=False, default=0)
+    rejected = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "total": self.total,
+            "pending": self.pending,
+            "accepted": self.accepted,
+            "rejected": self.rejected
+        }
+
+class Task(db.Model):
+    # Background task queue table; see task_queue.py
+    __tablename__ = 'task'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_task_status_run_at', 'status', 'run_at'),
+        db.Index('ix_task_status_locked_until', 'status', 'locked_until'),
+    )
+
+class Notification(db.Model):
+    __tablename__ = 'notification'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    read_at = db.Column(db.DateTime, nullable=True)
+    # Set for one-per-job notifications (job_match), so a fan-out that runs
+    # twice can't notify anyone twice; NULLs don't collide
+    job_id = db.Column(db.Integer, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_notification_user_id_created_at', 'user_id', 'created_at'),
+        db.UniqueConstraint('user_id', 'kind', 'job_id', name='uq_notification_user_kind_job'),
+    )
+
+    @timed_serialization
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "payload": json.loads(self.payload),
+            "created_at": self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+            "read": self.read_at is not None
+        }
+
+class JobMatch(db.Model):
+    # Precomputed worker/job match scores; see matching.py. Each row belongs to
+    # one top-N list: a job's candidates ('job') or a worker's matches ('worker'),
+    # so refreshing one side never touches the other side's lists
+    __tablename__ = 'job_match'
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    worker_id = db.Column(db.Integer, db.ForeignKey('worker.id'), primary_key=True)
+    direction = db.Column(db.String(10), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_job_match_job_id_direction_score', 'job_id', 'direction', 'score'),
+        db.Index('ix_job_match_worker_id_direction_score', 'worker_id', 'direction', 'score'),
+    )
+
+class Skill(db.Model):
+    # Canonical skill; free-text names resolve to it through SkillAlias (see skills.py)
+    __tablename__ = 'skill'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+    aliases = db.relationship('SkillAlias', backref='skill', cascade="all, delete-orphan")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "aliases": sorted(alias.alias for alias in self.aliases)
+        }
+
+class SkillAlias(db.Model):
+    __tablename__ = 'skill_alias'
+    alias = db.Column(db.String(100), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), nullable=False, index=True)
+
+# Worker/job <-> skill association tables. The (skill_id, owner) index makes
+# "who has skill X" an index range scan instead of a LIKE over a packed string
+def _skill_association(name, owner_column, owner_table):
+    return db.Table(
+        name,
+        db.Column(owner_column, db.Integer, db.ForeignKey(f'{owner_table}.id', ondelete='CASCADE'), primary_key=True),
+        db.Column('skill_id', db.Integer, db.ForeignKey('skill.id', ondelete='CASCADE'), primary_key=True),
+        db.Index(f'ix_{name}_skill_id_{owner_column}', 'skill_id', owner_column)
+    )
+
+worker_skill = _skill_association('worker_skill', 'worker_id', 'worker')
+worker_job_title = _skill_association('worker_job_title', 'worker_id', 'worker')
+job_skill = _skill_association('job_skill', 'job_id', 'job')
\ No newline at end of file
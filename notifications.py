@@ -0,0 +1,53 @@
+import json
+from datetime import datetime
+from sqlalchemy import literal
+from backend.models import db, Job, Worker, Application, Notification
+from backend.skills import extract_skill_ids, workers_for_skill_ids
+from backend.db_compat import insert_ignore
+from backend.task_queue import task
+
+NOTIFICATION_COLUMNS = ['user_id', 'kind', 'payload', 'job_id', 'created_at']
+
+
+# Runs in the task worker after post_job commits. The fan-out is a single
+# INSERT ... SELECT, so no rows stream through Python, and the unique key on
+# (user_id, kind, job_id) skips workers a previous run (say, one that
+# outlived its lease) already notified.
+@task('match_job_to_workers')
+def match_job_to_workers(job_id):
+    job = db.session.get(Job, job_id)
+    if not job:
+        return
+    skill_ids = [skill.id for skill in job.skill_tags] or extract_skill_ids(job.title)
+    if not skill_ids:
+        return
+
+    payload = json.dumps({"job_id": job.id, "title": job.title})
+    # Workers listing any of the job's skills, straight from the skill index
+    rows = workers_for_skill_ids(skill_ids).with_entities(
+        Worker.user_id,
+        literal('job_match'),
+        literal(payload),
+        literal(job.id),
+        literal(datetime.utcnow(), db.DateTime)
+    ).statement
+    db.session.execute(insert_ignore(Notification, NOTIFICATION_COLUMNS, rows, ['user_id', 'kind', 'job_id']))
+
+
+@task('notify_employer_of_application')
+def notify_employer_of_application(application_id):
+    application = db.session.get(Application, application_id)
+    if not application or not application.job:
+        return
+    job = application.job
+    # post_job stores the posting user's id in Job.employer_id
+    db.session.add(Notification(
+        user_id=job.employer_id,
+        kind='application_received',
+        payload=json.dumps({
+            "application_id": application.id,
+            "job_id": job.id,
+            "job_title": job.title,
+            "worker_id": application.worker_id
+        })
+    ))
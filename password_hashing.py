@@ -0,0 +1,102 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+DEFAULT_TIMEOUT_SECONDS = 10
+# werkzeug's defaults for the parameters a method string may leave out
+SCRYPT_DEFAULTS = (str(2 ** 15), '8', '1')
+PBKDF2_DEFAULTS = ('sha256', str(DEFAULT_PBKDF2_ITERATIONS))
+
+
+def method_prefix(method):
+    """The method as werkzeug writes it before the first '$' of a hash.
+
+    'scrypt' -> 'scrypt:32768:8:1', 'pbkdf2' -> 'pbkdf2:sha256:1000000'.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        return 'scrypt:' + ':'.join(str(int(value)) for value in args + list(SCRYPT_DEFAULTS[len(args):]))
+    if name == 'pbkdf2':
+        hash_name, iterations = args + list(PBKDF2_DEFAULTS[len(args):])
+        return f'pbkdf2:{hash_name}:{int(iterations)}'
+    return method
+
+
+class HasherSaturated(Exception):
+    """Raised when the hashing queue is full; callers should answer 429."""
+
+
+class PasswordHasher:
+    """Runs password hashing off the request thread with bounded queueing.
+
+    With `workers` > 0 hashes run in a process pool so a burst of logins
+    cannot pin every request worker on CPU; with 0 they run inline. Either
+    way at most `queue_depth` hashes may be in flight per process, after
+    which HasherSaturated is raised instead of queueing without bound.
+    """
+
+    def __init__(self, method=None, workers=0, queue_depth=None, timeout=DEFAULT_TIMEOUT_SECONDS):
+        self.configure(method, workers, queue_depth, timeout)
+
+    def configure(self, method=None, workers=0, queue_depth=None, timeout=DEFAULT_TIMEOUT_SECONDS):
+        self.method = method
+        self._prefix = method_prefix(method) if method else None
+        self.workers = workers
+        self.queue_depth = queue_depth or max(workers, 1) * 4
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.queue_depth)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.configure(
+            method=app.config.get('PASSWORD_HASH_METHOD'),
+            workers=app.config.get('PASSWORD_HASH_WORKERS', 0),
+            queue_depth=app.config.get('PASSWORD_HASH_QUEUE_DEPTH'),
+            timeout=app.config.get('PASSWORD_HASH_TIMEOUT', DEFAULT_TIMEOUT_SECONDS)
+        )
+
+    def _get_pool(self):
+        # Created lazily so the pool is started after a pre-forking server forks
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherSaturated("Too many concurrent password operations")
+        try:
+            if self.workers:
+                return self._get_pool().submit(fn, *args).result(timeout=self.timeout)
+            return fn(*args)
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        if self.method:
+            return self._run(generate_password_hash, password, self.method)
+        return self._run(generate_password_hash, password)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the stored hash was made with a different method or cost."""
+        if not self._prefix or not password_hash:
+            return False
+        return password_hash.split('$', 1)[0] != self._prefix
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+
+hasher = PasswordHasher()
+
+
+def default_workers():
+    return max((os.cpu_count() or 1) - 1, 1)
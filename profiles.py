@@ -1,6 +1,15 @@
 from flask import Blueprint, request, jsonify
 from backend.models import db, Worker, Employer
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from backend.search_index import search_index
+from backend.response_cache import cached_response, invalidate
+from backend.rate_limit import rate_limit
+from backend.user_cache import invalidate_user
+from backend.streaming import wants_stream, stream_query
+from backend.serialization import worker_schema, employer_schema, respond
+from backend.geo import apply_location, address_location, parse_near, nearest
+from backend.task_queue import enqueue
+from backend.skills import set_worker_skills, parse_skill_filter, filter_workers_by_skills
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 
 profiles_bp = Blueprint('profiles', __name__)
 
@@ -20,8 +29,19 @@ def create_worker_profile():
         email=data['email'],
         user_id=user_id
     )
+    apply_location(profile, data.get('location') or (current_user.location if current_user else None))
+    set_worker_skills(
+        profile,
+        data.get('skills', current_user.skills if current_user else None),
+        data.get('preferred_job_titles')
+    )
     db.session.add(profile)
+    db.session.flush()
+    enqueue('update_worker_matches', {'worker_id': profile.id})
     db.session.commit()
+    search_index.index('worker', profile)
+    invalidate('workers', f'worker:{user_id}')
+    invalidate_user(user_id)
     return jsonify({"msg": "Worker profile created"}), 201
 
 @profiles_bp.route('/profile/employer', methods=['POST'])
@@ -40,16 +60,49 @@ def create_employer_profile():
         email=data['email'],
         user_id=user_id
     )
+    apply_location(profile, address_location(data['address']))
     db.session.add(profile)
     db.session.commit()
+    search_index.index('employer', profile)
+    invalidate('employers')
+    invalidate_user(user_id)
     return jsonify({"msg": "Employer profile created"}), 201
 
 @profiles_bp.route('/workers', methods=['GET'])
+@rate_limit('60/minute')
 @jwt_required()
+@cached_response('workers')
 def get_all_workers():
-    return jsonify([worker.to_dict() for worker in Worker.query.all()]), 200
+    try:
+        near = parse_near(request.args)
+        skill_filter = parse_skill_filter(request.args)
+        encode = worker_schema.encoder(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # ?skills=welder,electrical&match=all is answered from the skill index
+    query = filter_workers_by_skills(Worker.query, *skill_filter) if skill_filter else Worker.query
+    if near:
+        limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+        return respond([
+            dict(encode(worker), distance_km=round(distance, 2))
+            for worker, distance in nearest(query, Worker, near, limit)
+        ])
+
+    if wants_stream():
+        return stream_query(query.order_by(Worker.id), encode)
+    return respond([encode(worker) for worker in query.all()])
 
 @profiles_bp.route('/employers', methods=['GET'])
+@rate_limit('60/minute')
 @jwt_required()
+@cached_response('employers')
 def get_all_employers():
-    return jsonify([employer.to_dict() for employer in Employer.query.all()]), 200
+    try:
+        encode = employer_schema.encoder(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if wants_stream():
+        return stream_query(Employer.query.order_by(Employer.id), encode)
+    return respond([encode(employer) for employer in Employer.query.all()])
@@ -0,0 +1,244 @@
+import math
+import time
+import threading
+from flask import g, request, jsonify, current_app
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from backend import redis_client
+from backend.subrequests import is_subrequest
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+KEY_FUNCS = ('user', 'ip')
+
+# Past this many keys the memory store drops buckets idle for IDLE_PRUNE_SECONDS;
+# for per-hour (or faster) policies those have refilled and carry no state
+DEFAULT_MAX_KEYS = 100000
+IDLE_PRUNE_SECONDS = 3600
+
+
+class Policy:
+    """Token bucket: `limit` requests per `period` seconds, bursting up to `burst`."""
+
+    def __init__(self, limit, period, burst=None, key='user', scope=None):
+        if key not in KEY_FUNCS:
+            raise ValueError(f"key must be one of {KEY_FUNCS}")
+        self.limit = limit
+        self.period = period
+        self.rate = limit / period
+        self.burst = burst or limit
+        self.key = key
+        self.scope = scope
+
+    @classmethod
+    def parse(cls, spec, **kwargs):
+        """Build a policy from "10/minute" style strings."""
+        try:
+            count, period = spec.split('/')
+            return cls(int(count), PERIODS[period.strip().rstrip('s')], **kwargs)
+        except (ValueError, KeyError):
+            raise ValueError(f"Invalid rate limit '{spec}', expected e.g. '10/minute'")
+
+
+class MemoryRateLimitStore:
+    """Per-process buckets; each worker process enforces the limit on its own."""
+
+    def __init__(self, max_keys=DEFAULT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def consume(self, key, rate, burst, cost=1):
+        """Take `cost` tokens; returns (allowed, remaining, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (cost - tokens) / rate
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return allowed, tokens - cost if allowed else tokens, retry_after
+
+    def _prune(self, now):
+        for key, (_, updated) in list(self._buckets.items()):
+            if now - updated > IDLE_PRUNE_SECONDS:
+                del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# Refill and take tokens atomically on the server; returns {allowed, remaining, retry_after}
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class RedisRateLimitStore:
+    """Buckets shared by every worker through a Redis-protocol server."""
+
+    def __init__(self, client=None, url=None, prefix='ratelimit:'):
+        self.client = client or redis_client.connect(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def consume(self, key, rate, burst, cost=1):
+        allowed, remaining, retry_after = self._script(
+            keys=[self.prefix + key], args=[rate, burst, time.time(), cost]
+        )
+        return bool(allowed), float(remaining), float(retry_after)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+class ConcurrencyLimiter:
+    """Caps the requests a process works on at once.
+
+    Requests beyond the cap are shed immediately with 503 instead of
+    queueing for a DB connection until the pool times out.
+    """
+
+    def __init__(self, max_in_flight):
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+    def acquire(self):
+        return self._slots.acquire(blocking=False)
+
+    def release(self):
+        self._slots.release()
+
+
+_store = MemoryRateLimitStore()
+
+
+def get_store():
+    return _store
+
+
+def set_store(store):
+    global _store
+    _store = store
+
+
+def rate_limit(spec, key='user', burst=None, scope=None):
+    """Attach a rate-limit policy to a view; enforced by init_rate_limiting's middleware.
+
+    key='user' buckets by JWT identity (falling back to the client IP for
+    anonymous requests), key='ip' always by client IP. Views sharing a
+    `scope` share a bucket. Place directly under the @route decorator.
+    """
+    policy = Policy.parse(spec, burst=burst, key=key, scope=scope)
+
+    def decorator(view):
+        view.rate_limit_policy = policy
+        return view
+    return decorator
+
+
+def long_lived(view):
+    """Exempt a streaming view from the concurrency cap; it enforces its own connection limit."""
+    view.concurrency_exempt = True
+    return view
+
+
+def _client_key(policy):
+    if policy.key == 'user':
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+        if identity is not None:
+            return f"user:{identity}"
+    return f"ip:{request.remote_addr}"
+
+
+def _reject(status, message, retry_after):
+    response = jsonify({"error": message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def init_rate_limiting(app):
+    kind = app.config.get('RATE_LIMIT_BACKEND', 'memory')
+    if kind == 'redis':
+        set_store(RedisRateLimitStore(url=app.config['RATE_LIMIT_REDIS_URL']))
+    elif kind == 'memory':
+        set_store(MemoryRateLimitStore())
+
+    overrides = {
+        endpoint: Policy.parse(spec) for endpoint, spec in app.config.get('RATE_LIMIT_POLICIES', {}).items()
+    }
+    default = Policy.parse(app.config['RATE_LIMIT_DEFAULT']) if app.config.get('RATE_LIMIT_DEFAULT') else None
+    max_in_flight = app.config.get('MAX_CONCURRENT_REQUESTS', 0)
+    limiter = ConcurrencyLimiter(max_in_flight) if max_in_flight else None
+
+    @app.before_request
+    def admit_request():
+        if request.method == 'OPTIONS' or request.endpoint == 'metrics':
+            return None
+
+        view = app.view_functions.get(request.endpoint)
+        # Shed load first: a rejected request must not cost a DB connection.
+        # Batched sub-requests run inside their already admitted batch request.
+        if limiter is not None and not getattr(view, 'concurrency_exempt', False) and not is_subrequest():
+            if not limiter.acquire():
+                return _reject(503, "Server is busy, please retry shortly", 1)
+            g.admitted = True
+
+        if kind == 'none':
+            return None
+        policy = overrides.get(request.endpoint) or getattr(view, 'rate_limit_policy', None) or default
+        if policy is None:
+            return None
+        bucket = f"{policy.scope or request.endpoint}:{_client_key(policy)}"
+        try:
+            allowed, remaining, retry_after = _store.consume(bucket, policy.rate, policy.burst)
+        except Exception as e:
+            # Fail open: a limiter outage must not take the API down
+            current_app.logger.warning(f"Rate limit store unavailable: {e}")
+            return None
+        g.rate_limit = (policy.limit, remaining)
+        if not allowed:
+            return _reject(429, "Too many requests, please slow down", retry_after)
+        return None
+
+    @app.after_request
+    def add_rate_limit_headers(response):
+        if g.get('rate_limit'):
+            limit, remaining = g.rate_limit
+            response.headers['X-RateLimit-Limit'] = str(limit)
+            response.headers['X-RateLimit-Remaining'] = str(max(0, int(remaining)))
+        return response
+
+    @app.teardown_request
+    def release_slot(_error=None):
+        if g.pop('admitted', False):
+            limiter.release()
@@ -0,0 +1,191 @@
+import re
+import time
+import heapq
+import threading
+from datetime import datetime
+from backend.models import Job
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = {"a", "an", "and", "the", "of", "for", "in", "on", "to", "with", "or", "at", "job", "jobs"}
+
+# Weights used when ranking candidate jobs for a worker
+OVERLAP_WEIGHT = 3.0
+SALARY_WEIGHT = 1.0
+FRESHNESS_WEIGHT = 1.0
+FRESHNESS_HALF_LIFE_DAYS = 14.0
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# How often sync() drops jobs past their deadline from memory
+EVICT_INTERVAL_SECONDS = 60
+
+
+def normalize_token(token):
+    # Very light stemming so "welders"/"welder" and "plumbing"/"plumber" meet in the index
+    for suffix in ("ing", "ers", "er", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            return token[:-len(suffix)]
+    return token
+
+
+def iter_tokens(text):
+    if not text:
+        return
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if len(token) > 1 and token not in STOP_WORDS:
+            yield normalize_token(token)
+
+
+def tokenize(text):
+    return set(iter_tokens(text))
+
+
+class JobRecommendationIndex:
+    """In-process inverted index from normalized title tokens to job ids.
+
+    The index is filled lazily from the database on first use and then kept
+    current by `add_job` (called after `post_job` commits) and by a cheap
+    catch-up query for ids above the highest one seen, which picks up jobs
+    posted through other worker processes. Jobs past their deadline are
+    skipped at query time and evicted every EVICT_INTERVAL_SECONDS, so a
+    long-lived process doesn't keep every expired job in memory.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._jobs = {}
+        self._max_job_id = 0
+        self._loaded = False
+        self._last_evict = time.monotonic()
+
+    def _index(self, job_id, title, salary_min, salary_max, posted_date, deadline_date):
+        tokens = tokenize(title)
+        previous = self._jobs.get(job_id)
+        if previous:
+            for token in previous["tokens"] - tokens:
+                self._postings.get(token, set()).discard(job_id)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(job_id)
+        self._jobs[job_id] = {
+            "tokens": tokens,
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "posted_date": posted_date,
+            "deadline_date": deadline_date,
+        }
+        self._max_job_id = max(self._max_job_id, job_id)
+
+    def _load_rows(self, query):
+        rows = query.with_entities(
+            Job.id, Job.title, Job.salary_min, Job.salary_max, Job.posted_date, Job.deadline_date
+        ).all()
+        for row in rows:
+            self._index(*row)
+
+    def sync(self):
+        with self._lock:
+            if not self._loaded:
+                self._load_rows(Job.query)
+                self._loaded = True
+            else:
+                self._load_rows(Job.query.filter(Job.id > self._max_job_id))
+            if time.monotonic() - self._last_evict >= EVICT_INTERVAL_SECONDS:
+                self._evict_expired(datetime.utcnow())
+
+    def _evict_expired(self, now):
+        # Ids stay below _max_job_id, so catch-up never loads them again
+        expired = [
+            job_id for job_id, entry in self._jobs.items()
+            if entry["deadline_date"] and entry["deadline_date"] < now
+        ]
+        for job_id in expired:
+            self.remove_job(job_id)
+        self._last_evict = time.monotonic()
+
+    def add_job(self, job):
+        with self._lock:
+            self._index(job.id, job.title, job.salary_min, job.salary_max, job.posted_date, job.deadline_date)
+
+    def remove_job(self, job_id):
+        with self._lock:
+            entry = self._jobs.pop(job_id, None)
+            if entry:
+                for token in entry["tokens"]:
+                    self._postings.get(token, set()).discard(job_id)
+
+    def reset(self):
+        with self._lock:
+            self._postings = {}
+            self._jobs = {}
+            self._max_job_id = 0
+            self._loaded = False
+            self._last_evict = time.monotonic()
+
+    def _score(self, entry, query_tokens, desired_salary, now):
+        overlap = len(entry["tokens"] & query_tokens) / len(query_tokens)
+
+        salary_fit = 0.5
+        offered = entry["salary_max"] or entry["salary_min"]
+        if desired_salary and offered:
+            salary_fit = min(offered / desired_salary, 1.0)
+
+        age_days = (now - entry["posted_date"]).total_seconds() / 86400 if entry["posted_date"] else 0
+        freshness = 0.5 ** (max(age_days, 0) / FRESHNESS_HALF_LIFE_DAYS)
+
+        return OVERLAP_WEIGHT * overlap + SALARY_WEIGHT * salary_fit + FRESHNESS_WEIGHT * freshness
+
+    def recommend(self, query_tokens, desired_salary=None, limit=DEFAULT_LIMIT, now=None):
+        """Return up to `limit` (job_id, score) pairs, best first."""
+        now = now or datetime.utcnow()
+        with self._lock:
+            candidates = set()
+            for token in query_tokens:
+                candidates |= self._postings.get(token, set())
+
+            scored = []
+            for job_id in candidates:
+                entry = self._jobs[job_id]
+                if entry["deadline_date"] and entry["deadline_date"] < now:
+                    continue
+                scored.append((self._score(entry, query_tokens, desired_salary, now), job_id))
+
+        return [(job_id, score) for score, job_id in heapq.nlargest(limit, scored)]
+
+
+job_index = JobRecommendationIndex()
+
+
+def worker_query_tokens(worker):
+    tokens = set()
+    for field in (worker.skills, worker.preferred_job_titles):
+        if field:
+            for value in field.split(","):
+                tokens |= tokenize(value)
+    return tokens
+
+
+def recommend_for_worker(worker, limit=DEFAULT_LIMIT):
+    """Return the top `limit` open jobs for `worker` as (Job, score) pairs."""
+    limit = max(1, min(limit, MAX_LIMIT))
+    query_tokens = worker_query_tokens(worker) if worker else set()
+
+    if not query_tokens:
+        # Nothing to match on yet: fall back to the newest open postings
+        now = datetime.utcnow()
+        jobs = (
+            Job.query.filter((Job.deadline_date.is_(None)) | (Job.deadline_date >= now))
+            .order_by(Job.posted_date.desc(), Job.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [(job, 0.0) for job in jobs]
+
+    job_index.sync()
+    ranked = job_index.recommend(query_tokens, worker.desired_salary, limit)
+    if not ranked:
+        return []
+
+    jobs_by_id = {job.id: job for job in Job.query.filter(Job.id.in_([job_id for job_id, _ in ranked])).all()}
+    return [(jobs_by_id[job_id], score) for job_id, score in ranked if job_id in jobs_by_id]
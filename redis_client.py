@@ -0,0 +1,15 @@
+# Shared helper for the optional Redis-protocol backends (response cache,
+# rate limiting, pub/sub, token revocation). Any server that speaks the
+# Redis protocol works, including a local stand-in for tests.
+
+_clients = {}
+
+
+def connect(url):
+    if url not in _clients:
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The 'redis' package is required for Redis-backed features: pip install redis")
+        _clients[url] = redis.Redis.from_url(url)
+    return _clients[url]
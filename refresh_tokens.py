@@ -0,0 +1,192 @@
+import time
+import uuid
+import logging
+import threading
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token, set_refresh_cookies
+from backend import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Refresh tokens rotate on every use. Each login starts a token family; the
+# store keeps only the family's current (and just-replaced) token id, so
+# access tokens are never looked up and stay fully stateless.
+
+FAMILY_CLAIM = 'fam'
+
+ROTATED = 'rotated'
+# The token replaced a moment ago: two tabs refreshing at once, not theft
+GRACE = 'grace'
+# An older token came back: the family is revoked and must log in again
+REUSED = 'reused'
+REVOKED = 'revoked'
+
+DEFAULT_REUSE_GRACE_SECONDS = 10
+DEFAULT_MAX_FAMILIES = 100000
+
+
+class MemoryRefreshTokenStore:
+    """Per-process token families; run a single process or use the Redis store."""
+
+    def __init__(self, max_families=DEFAULT_MAX_FAMILIES):
+        self.max_families = max_families
+        self._lock = threading.Lock()
+        self._families = {}
+
+    def start(self, family, jti, ttl):
+        now = time.time()
+        with self._lock:
+            self._families[family] = (jti, None, now, now + ttl)
+            if len(self._families) > self.max_families:
+                self._prune(now)
+
+    def rotate(self, family, jti, new_jti, ttl, grace):
+        """Swap `jti` for `new_jti` if it is the family's current token; returns a status."""
+        now = time.time()
+        with self._lock:
+            entry = self._families.get(family)
+            if entry is None or entry[3] <= now:
+                self._families.pop(family, None)
+                return REVOKED
+            current, previous, rotated_at, _ = entry
+            if jti == current:
+                self._families[family] = (new_jti, jti, now, now + ttl)
+                return ROTATED
+            if jti == previous and now - rotated_at < grace:
+                return GRACE
+            del self._families[family]
+            return REUSED
+
+    def revoke(self, family):
+        with self._lock:
+            self._families.pop(family, None)
+
+    def _prune(self, now):
+        for family, entry in list(self._families.items()):
+            if entry[3] <= now:
+                del self._families[family]
+
+    def clear(self):
+        with self._lock:
+            self._families.clear()
+
+
+# Compare-and-swap of a family's current token id; returns the rotation status
+ROTATE_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'current', 'previous', 'rotated_at')
+if not state[1] then
+    return 'revoked'
+end
+if state[1] == ARGV[1] then
+    redis.call('HSET', KEYS[1], 'current', ARGV[2], 'previous', ARGV[1], 'rotated_at', ARGV[3])
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    return 'rotated'
+end
+if state[2] == ARGV[1] and tonumber(ARGV[3]) - tonumber(state[3]) < tonumber(ARGV[5]) then
+    return 'grace'
+end
+redis.call('DEL', KEYS[1])
+return 'reused'
+"""
+
+
+class RedisRefreshTokenStore:
+    """Token families shared by every worker through a Redis-protocol server."""
+
+    def __init__(self, client=None, url=None, prefix='refresh:'):
+        self.client = client or redis_client.connect(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(ROTATE_SCRIPT)
+
+    def start(self, family, jti, ttl):
+        key = self.prefix + family
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping={'current': jti, 'rotated_at': time.time()})
+        pipe.expire(key, ttl)
+        pipe.execute()
+
+    def rotate(self, family, jti, new_jti, ttl, grace):
+        status = self._script(keys=[self.prefix + family], args=[jti, new_jti, time.time(), ttl, grace])
+        return status.decode() if isinstance(status, bytes) else status
+
+    def revoke(self, family):
+        self.client.delete(self.prefix + family)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+_store = MemoryRefreshTokenStore()
+
+
+def get_store():
+    return _store
+
+
+def set_store(store):
+    global _store
+    _store = store
+
+
+def init_refresh_tokens(app):
+    if app.config.get('REFRESH_TOKEN_BACKEND', 'memory') == 'redis':
+        set_store(RedisRefreshTokenStore(url=app.config['REFRESH_TOKEN_REDIS_URL']))
+    else:
+        set_store(MemoryRefreshTokenStore())
+
+
+def _refresh_ttl():
+    return int(current_app.config['JWT_REFRESH_TOKEN_EXPIRES'].total_seconds())
+
+
+def _refresh_token(identity, family, jti):
+    return create_refresh_token(identity=identity, additional_claims={FAMILY_CLAIM: family, 'jti': jti})
+
+
+def issue_tokens(user_id):
+    """Start a new token family at login; returns (access_token, refresh_token).
+
+    If the store is unreachable the login still succeeds, just without a
+    refresh token.
+    """
+    identity = str(user_id)
+    family, jti = uuid.uuid4().hex, uuid.uuid4().hex
+    try:
+        _store.start(family, jti, _refresh_ttl())
+    except Exception as e:
+        logger.warning(f"Refresh token store unavailable: {e}")
+        return create_access_token(identity=identity), None
+    return create_access_token(identity=identity), _refresh_token(identity, family, jti)
+
+
+def rotate_tokens(claims):
+    """Exchange a verified refresh token's claims for new tokens.
+
+    Returns (status, access_token, refresh_token); the refresh token is None
+    unless the status is ROTATED, and both are None for REUSED/REVOKED.
+    """
+    family = claims.get(FAMILY_CLAIM)
+    if not family:
+        return REVOKED, None, None
+    identity = claims['sub']
+    new_jti = uuid.uuid4().hex
+    grace = current_app.config.get('REFRESH_TOKEN_REUSE_GRACE_SECONDS', DEFAULT_REUSE_GRACE_SECONDS)
+    status = _store.rotate(family, claims['jti'], new_jti, _refresh_ttl(), grace)
+    if status == ROTATED:
+        return status, create_access_token(identity=identity), _refresh_token(identity, family, new_jti)
+    if status == GRACE:
+        return status, create_access_token(identity=identity), None
+    return status, None, None
+
+
+def set_refresh_cookie(response, refresh_token):
+    # The cookie lives exactly as long as the token in it
+    set_refresh_cookies(response, refresh_token, max_age=_refresh_ttl())
+
+
+def revoke_tokens(claims):
+    family = claims.get(FAMILY_CLAIM) if claims else None
+    if family:
+        _store.revoke(family)
@@ -0,0 +1,216 @@
+import time
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from flask import request, make_response, current_app
+from flask_jwt_extended import get_jwt_identity
+from backend import redis_client
+from backend.serialization import response_format, JSON_MIMETYPE, MSGPACK_MIMETYPES
+
+DEFAULT_TTL_SECONDS = 60
+DEFAULT_MAX_ENTRIES = 1024
+CACHEABLE_MIMETYPES = {JSON_MIMETYPE, *MSGPACK_MIMETYPES}
+
+
+class MemoryCacheBackend:
+    """Per-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generations = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_generations(self, namespaces):
+        with self._lock:
+            return [self._generations.get(namespace, 0) for namespace in namespaces]
+
+    def bump(self, namespaces):
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+class RedisCacheBackend:
+    """Cache shared by every worker through a Redis-protocol server.
+
+    Eviction is left to the server (run it with an LRU maxmemory-policy);
+    entries carry their TTL via SETEX.
+    """
+
+    def __init__(self, client=None, url=None, prefix='cache:'):
+        self.client = client or redis_client.connect(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self.client.setex(self.prefix + key, int(ttl), value)
+
+    def get_generations(self, namespaces):
+        if not namespaces:
+            return []
+        values = self.client.mget([f"{self.prefix}gen:{namespace}" for namespace in namespaces])
+        return [int(value) if value else 0 for value in values]
+
+    def bump(self, namespaces):
+        pipeline = self.client.pipeline()
+        for namespace in namespaces:
+            pipeline.incr(f"{self.prefix}gen:{namespace}")
+        pipeline.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+class NullCacheBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def get_generations(self, namespaces):
+        return [0] * len(namespaces)
+
+    def bump(self, namespaces):
+        pass
+
+    def clear(self):
+        pass
+
+
+_backend = MemoryCacheBackend()
+
+
+def get_backend():
+    return _backend
+
+
+def set_backend(backend):
+    global _backend
+    _backend = backend
+
+
+def init_response_cache(app):
+    kind = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+    if kind == 'redis':
+        set_backend(RedisCacheBackend(url=app.config['RESPONSE_CACHE_REDIS_URL']))
+    elif kind == 'none':
+        set_backend(NullCacheBackend())
+    else:
+        set_backend(MemoryCacheBackend(app.config.get('RESPONSE_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)))
+
+
+def invalidate(*namespaces):
+    """Drop every cached response that depends on any of `namespaces`.
+
+    Namespaces are versioned rather than scanned: bumping a namespace's
+    generation changes the key of every response built from it.
+    """
+    _backend.bump(namespaces)
+
+
+def compute_etag(body):
+    return hashlib.sha1(body).hexdigest()
+
+
+def _not_modified(etag):
+    return request.if_none_match and request.if_none_match.contains(etag)
+
+
+def _conditional_response(body, etag, mimetype):
+    if _not_modified(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(body, 200)
+        response.mimetype = mimetype
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    return response
+
+
+def cached_response(*namespaces, ttl=None, per_user=False):
+    """Cache a GET view keyed by endpoint, query string, response format and (optionally) user.
+
+    Namespaces may contain "{user}", which is filled with the JWT identity
+    so that personalized routes can be invalidated for a single user.
+    Apply below @jwt_required() so authentication still runs first.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+
+            user = str(get_jwt_identity()) if per_user or any('{user}' in n for n in namespaces) else ''
+            resolved = [namespace.format(user=user) for namespace in namespaces]
+
+            try:
+                generations = _backend.get_generations(resolved)
+                raw_key = "|".join([
+                    request.endpoint,
+                    user,
+                    response_format(),
+                    "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True))),
+                    repr(kwargs),
+                    ",".join(map(str, generations))
+                ])
+                key = 'resp2:' + hashlib.sha1(raw_key.encode()).hexdigest()
+                cached = _backend.get(key)
+            except Exception as e:
+                # A cache outage must never take the endpoint down with it
+                current_app.logger.warning(f"Response cache unavailable: {e}")
+                key, cached = None, None
+
+            if cached is not None:
+                etag, mimetype, body = cached.split(b'\n', 2)
+                return _conditional_response(body, etag.decode(), mimetype.decode())
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.mimetype not in CACHEABLE_MIMETYPES or response.is_streamed:
+                return response
+
+            body = response.get_data()
+            etag = compute_etag(body)
+            if key:
+                try:
+                    _backend.set(key, b'\n'.join([etag.encode(), response.mimetype.encode(), body]),
+                                 ttl or current_app.config.get('RESPONSE_CACHE_TTL', DEFAULT_TTL_SECONDS))
+                except Exception as e:
+                    current_app.logger.warning(f"Response cache unavailable: {e}")
+
+            if _not_modified(etag):
+                response = make_response('', 304)
+            response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,32 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from backend.search_index import search_index, DOC_TYPES, DEFAULT_LIMIT, MAX_LIMIT
+from backend.rate_limit import rate_limit
+
+search_bp = Blueprint('search', __name__)
+
+# Typeahead search over jobs, workers and employers, served from memory
+@search_bp.route('/', methods=['GET'])
+@rate_limit('300/minute')  # typeahead: one request per keystroke
+@jwt_required()
+def search():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Missing query parameter: q"}), 400
+
+    doc_types = DOC_TYPES
+    if request.args.get('type'):
+        doc_types = tuple(t.strip() for t in request.args['type'].split(','))
+        unknown = [t for t in doc_types if t not in DOC_TYPES]
+        if unknown:
+            return jsonify({"error": f"Unknown search type: {', '.join(unknown)}"}), 400
+
+    limit = max(1, min(request.args.get('limit', DEFAULT_LIMIT, type=int), MAX_LIMIT))
+
+    try:
+        return jsonify({
+            "query": query,
+            "results": search_index.search(query, doc_types, limit)
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
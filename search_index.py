@@ -0,0 +1,253 @@
+import math
+import time
+import bisect
+import heapq
+import threading
+from datetime import datetime, timedelta
+from collections import Counter
+from sqlalchemy import or_
+from backend.models import Job, Worker, Employer
+from backend.recommendations import iter_tokens, normalize_token, TOKEN_PATTERN, STOP_WORDS
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Prefix matches on the last (still being typed) query term score below exact hits
+PREFIX_WEIGHT = 0.8
+MAX_PREFIX_EXPANSIONS = 50
+
+# How often a process looks for rows inserted or edited by other workers
+CATCH_UP_INTERVAL_SECONDS = 30
+# Rows changed this long before the previous catch-up are read again, for
+# transactions that committed late and small clock differences between hosts
+CATCH_UP_OVERLAP_SECONDS = 30
+# Expired job ids checked per query when looking for archived jobs
+PRUNE_BATCH_SIZE = 1000
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+DOC_TYPES = ('job', 'worker', 'employer')
+
+
+def job_document(job):
+    return job.title, {
+        "id": job.id,
+        "title": job.title,
+        "employer_id": job.employer_id,
+        "job_type": job.job_type
+    }
+
+
+def worker_document(worker):
+    text = " ".join(filter(None, [worker.skills, worker.bio]))
+    return text, {
+        "id": worker.id,
+        "name": worker.name,
+        "skills": worker.skills.split(",") if worker.skills else []
+    }
+
+
+def employer_document(employer):
+    text = " ".join(filter(None, [employer.company_name, employer.industry]))
+    return text, {
+        "id": employer.id,
+        "company_name": employer.company_name,
+        "industry": employer.industry
+    }
+
+
+DOCUMENT_BUILDERS = {
+    'job': (Job, job_document),
+    'worker': (Worker, worker_document),
+    'employer': (Employer, employer_document),
+}
+
+
+class SearchIndex:
+    """Tokenizing, prefix-capable inverted index with BM25 ranking.
+
+    Queries are answered purely from memory. The index is built from the
+    database on first use, updated in place by the write endpoints, and
+    picks up rows inserted or edited (by updated_at) in other processes at
+    most every CATCH_UP_INTERVAL_SECONDS, when it also drops expired jobs
+    the archive sweeper has removed. `rebuild()` reloads everything.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        # doc_type -> term -> {doc_id: term frequency}
+        self._postings = {doc_type: {} for doc_type in DOC_TYPES}
+        # doc_type -> doc_id -> (Counter of terms, document length, payload)
+        self._docs = {doc_type: {} for doc_type in DOC_TYPES}
+        self._total_length = {doc_type: 0 for doc_type in DOC_TYPES}
+        self._max_id = {doc_type: 0 for doc_type in DOC_TYPES}
+        # job id -> deadline, so catch-up only has to look up expired jobs
+        self._deadlines = {}
+        # Sorted surface (unstemmed) words, each mapped to its indexed stem, so a
+        # half-typed word like "weldi" still expands to the stem "weld"
+        self._surfaces = []
+        self._stems = {}
+        self._loaded = False
+        self._last_catch_up = 0.0
+        # utcnow() when the last load or catch-up started; updated_at uses the same clock
+        self._synced_at = None
+
+    def _add_surfaces(self, text):
+        for word in TOKEN_PATTERN.findall(text.lower()) if text else ():
+            if len(word) > 1 and word not in STOP_WORDS and word not in self._stems:
+                self._stems[word] = normalize_token(word)
+                bisect.insort(self._surfaces, word)
+
+    def _remove(self, doc_type, doc_id):
+        if doc_type == 'job':
+            self._deadlines.pop(doc_id, None)
+        existing = self._docs[doc_type].pop(doc_id, None)
+        if not existing:
+            return
+        terms, length, _ = existing
+        self._total_length[doc_type] -= length
+        postings = self._postings[doc_type]
+        for term in terms:
+            postings[term].pop(doc_id, None)
+            if not postings[term]:
+                del postings[term]
+
+    def _put(self, doc_type, doc_id, text, payload):
+        self._remove(doc_type, doc_id)
+        terms = Counter(iter_tokens(text))
+        length = sum(terms.values())
+        self._docs[doc_type][doc_id] = (terms, length, payload)
+        self._total_length[doc_type] += length
+        postings = self._postings[doc_type]
+        for term, frequency in terms.items():
+            postings.setdefault(term, {})[doc_id] = frequency
+        self._add_surfaces(text)
+        self._max_id[doc_type] = max(self._max_id[doc_type], doc_id)
+
+    def _load(self, doc_type, min_id=0, changed_since=None):
+        model, builder = DOCUMENT_BUILDERS[doc_type]
+        query = model.query
+        if changed_since:
+            query = query.filter(or_(model.id > min_id, model.updated_at >= changed_since))
+        elif min_id:
+            query = query.filter(model.id > min_id)
+        for obj in query.yield_per(1000):
+            self._put_object(doc_type, obj, builder)
+
+    def _put_object(self, doc_type, obj, builder):
+        text, payload = builder(obj)
+        self._put(doc_type, obj.id, text, payload)
+        if doc_type == 'job' and obj.deadline_date:
+            self._deadlines[obj.id] = obj.deadline_date
+
+    def _prune_archived_jobs(self):
+        # The sweeper only updates its own process's index; anywhere else an
+        # archived job is an expired id whose row is gone
+        now = datetime.utcnow()
+        expired = [job_id for job_id, deadline in self._deadlines.items() if deadline < now]
+        for start in range(0, len(expired), PRUNE_BATCH_SIZE):
+            batch = expired[start:start + PRUNE_BATCH_SIZE]
+            existing = {row.id for row in Job.query.with_entities(Job.id).filter(Job.id.in_(batch))}
+            for job_id in batch:
+                if job_id not in existing:
+                    self._remove('job', job_id)
+
+    def _ensure_current(self):
+        now = time.monotonic()
+        with self._lock:
+            if not self._loaded:
+                self._synced_at = datetime.utcnow()
+                for doc_type in DOC_TYPES:
+                    self._load(doc_type)
+                self._loaded = True
+                self._last_catch_up = now
+            elif now - self._last_catch_up >= CATCH_UP_INTERVAL_SECONDS:
+                started = datetime.utcnow()
+                changed_since = self._synced_at - timedelta(seconds=CATCH_UP_OVERLAP_SECONDS)
+                for doc_type in DOC_TYPES:
+                    self._load(doc_type, self._max_id[doc_type], changed_since)
+                self._prune_archived_jobs()
+                self._synced_at = started
+                self._last_catch_up = now
+
+    def rebuild(self):
+        with self._lock:
+            self._clear()
+            self._ensure_current()
+            return {doc_type: len(self._docs[doc_type]) for doc_type in DOC_TYPES}
+
+    def index(self, doc_type, obj):
+        # Only keep the index warm once it has been loaded; otherwise the
+        # first search will pick the row up from the database anyway
+        with self._lock:
+            if not self._loaded:
+                return
+            _, builder = DOCUMENT_BUILDERS[doc_type]
+            self._put_object(doc_type, obj, builder)
+
+    def remove(self, doc_type, doc_id):
+        with self._lock:
+            self._remove(doc_type, doc_id)
+
+    def _expand_prefix(self, prefix):
+        # Stems of the indexed words starting with `prefix`; the stem itself may
+        # be shorter than the prefix ("plumbe" -> "plumber" -> "plumb")
+        start = bisect.bisect_left(self._surfaces, prefix)
+        expansions = []
+        for word in self._surfaces[start:]:
+            if not word.startswith(prefix) or len(expansions) >= MAX_PREFIX_EXPANSIONS:
+                break
+            if self._stems[word] not in expansions:
+                expansions.append(self._stems[word])
+        return expansions
+
+    def _query_terms(self, query):
+        """Return {term: weight}; the final raw token also matches as a prefix."""
+        raw_tokens = TOKEN_PATTERN.findall(query.lower())
+        weights = {}
+        for term in iter_tokens(" ".join(raw_tokens[:-1])):
+            weights[term] = 1.0
+        if raw_tokens:
+            last = raw_tokens[-1]
+            for term in self._expand_prefix(last):
+                weights.setdefault(term, PREFIX_WEIGHT)
+            weights[normalize_token(last)] = 1.0
+        return weights
+
+    def search(self, query, doc_types=DOC_TYPES, limit=DEFAULT_LIMIT):
+        self._ensure_current()
+        with self._lock:
+            weights = self._query_terms(query)
+            results = []
+            for doc_type in doc_types:
+                docs = self._docs[doc_type]
+                if not docs:
+                    continue
+                postings = self._postings[doc_type]
+                average_length = self._total_length[doc_type] / len(docs) or 1.0
+                scores = {}
+                for term, weight in weights.items():
+                    matches = postings.get(term)
+                    if not matches:
+                        continue
+                    idf = math.log(1 + (len(docs) - len(matches) + 0.5) / (len(matches) + 0.5))
+                    for doc_id, frequency in matches.items():
+                        length = docs[doc_id][1]
+                        norm = frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * length / average_length))
+                        scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * norm
+                for doc_id, score in scores.items():
+                    results.append((score, doc_type, doc_id))
+
+            top = heapq.nlargest(limit, results)
+            return [
+                dict(self._docs[doc_type][doc_id][2], type=doc_type, score=round(score, 4))
+                for score, doc_type, doc_id in top
+            ]
+
+
+search_index = SearchIndex()
@@ -0,0 +1,350 @@
+import re
+import time
+import threading
+from sqlalchemy import select, func, false, union, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from backend.models import db, Skill, SkillAlias, Worker, Job, worker_skill, worker_job_title, job_skill
+
+MATCH_MODES = ('any', 'all')
+
+# How long a process reuses its alias -> skill id map
+ALIAS_CACHE_TTL_SECONDS = 300
+
+# Longest alias, in words, looked for when extracting skills from a job title
+MAX_ALIAS_WORDS = 3
+
+WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+# Seed taxonomy: canonical name -> synonyms. Anything not listed here becomes
+# its own skill the first time a worker or job uses it.
+BUILTIN_SKILLS = {
+    "electrician": ["electrical", "electric", "electricians", "electrical work", "wiring"],
+    "welder": ["welding", "welders", "fabricator", "fabrication"],
+    "plumber": ["plumbing", "plumbers", "pipe fitting"],
+    "pipefitter": ["pipefitting", "pipefitters", "steamfitter"],
+    "carpenter": ["carpentry", "carpenters", "woodworking", "joiner", "joinery"],
+    "mason": ["masonry", "masons", "bricklayer", "bricklaying", "brick laying"],
+    "painter": ["painting", "painters", "decorator"],
+    "roofer": ["roofing", "roofers"],
+    "mechanic": ["mechanics", "auto mechanic", "vehicle repair", "automotive"],
+    "hvac technician": ["hvac", "heating", "air conditioning", "refrigeration"],
+    "driver": ["driving", "drivers", "truck driver", "trucking", "cdl", "delivery driver"],
+    "forklift operator": ["forklift", "forklift driver", "reach truck"],
+    "warehouse associate": ["warehouse", "warehousing", "picker", "packer", "order picking"],
+    "machinist": ["machining", "machinists", "cnc", "cnc operator"],
+    "landscaper": ["landscaping", "gardener", "gardening", "groundskeeper"],
+    "janitor": ["janitorial", "cleaner", "cleaning", "custodian"],
+    "cook": ["cooking", "line cook", "chef", "kitchen"],
+    "ironworker": ["ironwork", "ironworkers", "steel erector"],
+    "glazier": ["glazing", "glaziers", "glass installer"],
+    "drywall installer": ["drywall", "drywaller", "plasterer", "plastering"],
+    "concrete finisher": ["concrete", "concreting", "cement mason"],
+    "heavy equipment operator": ["excavator", "excavator operator", "bulldozer", "backhoe", "equipment operator"],
+    "crane operator": ["crane", "rigger", "rigging"],
+    "tiler": ["tiling", "tile setter", "tilers"],
+    "security guard": ["security", "guard", "watchman"],
+    "construction laborer": ["laborer", "labourer", "general labor", "construction"],
+}
+
+
+def normalize_name(name):
+    return " ".join(WORD_PATTERN.findall((name or "").lower()))
+
+
+def split_names(value):
+    """Accept a list or a comma-separated string; return unique normalized names in order."""
+    if value is None:
+        return []
+    items = value if isinstance(value, (list, tuple)) else str(value).split(",")
+    names = []
+    for item in items:
+        name = normalize_name(item)
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+class AliasCache:
+    """Process-local alias -> skill id map; the taxonomy is small and read-mostly."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aliases = {}
+        self._loaded_at = 0.0
+
+    def get(self):
+        with self._lock:
+            if time.monotonic() - self._loaded_at > ALIAS_CACHE_TTL_SECONDS:
+                self._aliases = dict(db.session.query(SkillAlias.alias, SkillAlias.skill_id).all())
+                self._loaded_at = time.monotonic()
+            return self._aliases
+
+    def update(self, aliases):
+        with self._lock:
+            self._aliases = dict(self._aliases, **aliases)
+
+    def clear(self):
+        with self._lock:
+            self._loaded_at = 0.0
+
+
+alias_cache = AliasCache()
+
+# Aliases created in the session's current transaction. They reach the
+# process-wide cache only when it commits, so a rolled-back chunk (see
+# job_bulk._flush) never leaves skill ids behind that don't exist.
+PENDING_ALIASES_KEY = 'skills.pending_aliases'
+
+
+def _publish_pending_aliases(session):
+    # after_commit also fires when a savepoint is released
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(PENDING_ALIASES_KEY, None)
+    if pending:
+        alias_cache.update(pending)
+
+
+def _drop_pending_aliases(session, _previous_transaction):
+    # Any rollback, savepoints included; a dropped alias that did survive is
+    # simply found again by _create_skill's IntegrityError path
+    session.info.pop(PENDING_ALIASES_KEY, None)
+
+
+event.listen(Session, 'after_commit', _publish_pending_aliases)
+event.listen(Session, 'after_soft_rollback', _drop_pending_aliases)
+
+
+def _lookup(name, aliases):
+    if name in aliases:
+        return aliases[name]
+    # "welders" -> "welder", "electricians" -> "electrician"
+    if name.endswith('s') and name[:-1] in aliases:
+        return aliases[name[:-1]]
+    return None
+
+
+def _create_skill(name):
+    try:
+        with db.session.begin_nested():
+            skill = Skill(name=name)
+            skill.aliases.append(SkillAlias(alias=name))
+            db.session.add(skill)
+        return skill.id
+    except IntegrityError:
+        # Another request created it first
+        return db.session.query(SkillAlias.skill_id).filter_by(alias=name).scalar()
+
+
+def resolve_ids(names, create=False):
+    """Map normalized names to skill ids, in order and without duplicates.
+
+    Unknown names are skipped, or added as new skills when `create` is set.
+    """
+    aliases = alias_cache.get()
+    ids = []
+    for name in names:
+        skill_id = _lookup(name, aliases)
+        if skill_id is None:
+            skill_id = _lookup(name, db.session.info.get(PENDING_ALIASES_KEY, {}))
+        if skill_id is None and create:
+            skill_id = _create_skill(name)
+            # Looked up again: a savepoint rollback inside _create_skill drops the map
+            db.session.info.setdefault(PENDING_ALIASES_KEY, {})[name] = skill_id
+        if skill_id is not None and skill_id not in ids:
+            ids.append(skill_id)
+    return ids
+
+
+def _skills(ids):
+    return Skill.query.filter(Skill.id.in_(ids)).all() if ids else []
+
+
+def extract_skill_ids(text):
+    """Find known skills in free text such as a job title, longest alias first."""
+    words = normalize_name(text).split()
+    aliases = alias_cache.get()
+    ids = []
+    start = 0
+    while start < len(words):
+        for size in range(min(MAX_ALIAS_WORDS, len(words) - start), 0, -1):
+            skill_id = _lookup(" ".join(words[start:start + size]), aliases)
+            if skill_id is not None:
+                if skill_id not in ids:
+                    ids.append(skill_id)
+                start += size
+                break
+        else:
+            start += 1
+    return ids
+
+
+def _display_text(value):
+    # What the worker typed; a list is stored the way it would have been typed
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(str(item).strip() for item in value if str(item).strip())
+    return str(value).strip() or None
+
+
+def set_worker_skills(worker, skills=None, job_titles=None):
+    """Replace a worker's skills and/or preferred job titles (None leaves them as is).
+
+    The string columns keep the raw text for display; only the association
+    tables hold the normalized skills.
+    """
+    if skills is not None:
+        worker.skills = _display_text(skills)
+        worker.skill_tags = _skills(resolve_ids(split_names(skills), create=True))
+    if job_titles is not None:
+        worker.preferred_job_titles = _display_text(job_titles)
+        worker.job_title_tags = _skills(resolve_ids(split_names(job_titles), create=True))
+
+
+def set_job_skills(job, skills=None):
+    """Tag a job with explicit skills, or with the skills found in its title."""
+    if skills is not None:
+        ids = resolve_ids(split_names(skills), create=True)
+    else:
+        ids = extract_skill_ids(job.title)
+    job.skill_tags = _skills(ids)
+
+
+def parse_skill_filter(args, key='skills'):
+    """Read ?skills=a,b&match=any|all; returns (names, match) or None. Raises ValueError."""
+    names = split_names(args.get(key))
+    if not names:
+        return None
+    match = args.get('match', 'any')
+    if match not in MATCH_MODES:
+        raise ValueError("match must be 'any' or 'all'")
+    return names, match
+
+
+def _holders(table, owner_column, ids, match):
+    owner = table.c[owner_column]
+    query = select(owner).where(table.c.skill_id.in_(ids))
+    if match == 'all':
+        # Served from the (skill_id, owner) index: one range per skill, grouped by owner
+        query = query.group_by(owner).having(func.count(table.c.skill_id) == len(ids))
+    return query
+
+
+def _filter(query, id_column, table, owner_column, names, match):
+    aliases = alias_cache.get()
+    ids = []
+    for name in names:
+        skill_id = _lookup(name, aliases)
+        if skill_id is None:
+            if match == 'all':
+                # A skill nobody has can never be satisfied
+                return query.filter(false())
+            continue
+        if skill_id not in ids:
+            ids.append(skill_id)
+    if not ids:
+        return query.filter(false())
+    return query.filter(id_column.in_(_holders(table, owner_column, ids, match)))
+
+
+def filter_workers_by_skills(query, names, match='any'):
+    return _filter(query, Worker.id, worker_skill, 'worker_id', names, match)
+
+
+def filter_jobs_by_skills(query, names, match='any'):
+    return _filter(query, Job.id, job_skill, 'job_id', names, match)
+
+
+def workers_with_skills(names, match='any'):
+    """Workers having any/all of the named skills (aliases accepted)."""
+    return filter_workers_by_skills(Worker.query, names, match)
+
+
+def jobs_with_skills(names, match='any'):
+    """Jobs tagged with any/all of the named skills (aliases accepted)."""
+    return filter_jobs_by_skills(Job.query, names, match)
+
+
+def workers_for_skill_ids(ids):
+    """Workers with any of the skills either as a skill or as a preferred job title."""
+    if not ids:
+        return Worker.query.filter(false())
+    return Worker.query.filter(Worker.id.in_(union(
+        _holders(worker_skill, 'worker_id', ids, 'any'),
+        _holders(worker_job_title, 'worker_id', ids, 'any')
+    )))
+
+
+def seed_taxonomy():
+    """Insert the built-in skills and aliases that aren't there yet; returns how many aliases were added."""
+    existing = dict(db.session.query(SkillAlias.alias, SkillAlias.skill_id).all())
+    added = 0
+    for name, synonyms in BUILTIN_SKILLS.items():
+        skill_id = existing.get(name)
+        if skill_id is None:
+            skill = Skill(name=name)
+            db.session.add(skill)
+            db.session.flush()
+            skill_id = skill.id
+        for alias in [name] + synonyms:
+            if alias not in existing:
+                db.session.add(SkillAlias(alias=alias, skill_id=skill_id))
+                existing[alias] = skill_id
+                added += 1
+    db.session.commit()
+    alias_cache.clear()
+    return added
+
+
+def _batches(query, id_column, batch_size):
+    last_id = 0
+    while True:
+        rows = query.filter(id_column > last_id).order_by(id_column).limit(batch_size).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def _replace_rows(table, owner_column, owner_ids, rows):
+    db.session.execute(table.delete().where(table.c[owner_column].in_(owner_ids)))
+    if rows:
+        db.session.execute(table.insert(), rows)
+
+
+def backfill(batch_size=1000):
+    """Populate the association tables from the legacy comma-joined columns.
+
+    Worker rows are rebuilt from the strings, so re-running is safe; jobs are
+    only tagged from their title when they have no skills yet (e.g. rows
+    imported before the bulk importer tagged them), so explicitly tagged
+    jobs are kept.
+    """
+    counts = {'aliases': seed_taxonomy(), 'workers': 0, 'jobs': 0}
+
+    workers = Worker.query.with_entities(Worker.id, Worker.skills, Worker.preferred_job_titles)
+    for rows in _batches(workers, Worker.id, batch_size):
+        ids = [row.id for row in rows]
+        _replace_rows(worker_skill, 'worker_id', ids, [
+            {'worker_id': row.id, 'skill_id': skill_id}
+            for row in rows for skill_id in resolve_ids(split_names(row.skills), create=True)
+        ])
+        _replace_rows(worker_job_title, 'worker_id', ids, [
+            {'worker_id': row.id, 'skill_id': skill_id}
+            for row in rows for skill_id in resolve_ids(split_names(row.preferred_job_titles), create=True)
+        ])
+        db.session.commit()
+        counts['workers'] += len(rows)
+
+    untagged = (
+        Job.query
+        .filter(~Job.id.in_(select(job_skill.c.job_id)))
+        .with_entities(Job.id, Job.title)
+    )
+    for rows in _batches(untagged, Job.id, batch_size):
+        tags = [{'job_id': row.id, 'skill_id': skill_id} for row in rows for skill_id in extract_skill_ids(row.title)]
+        if tags:
+            db.session.execute(job_skill.insert(), tags)
+        db.session.commit()
+        counts['jobs'] += len({tag['job_id'] for tag in tags})
+    return counts
@@ -0,0 +1,47 @@
+from flask import request, Response, stream_with_context
+from backend.serialization import dumps
+
+DEFAULT_BATCH_SIZE = 500
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson():
+    return request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def wants_stream():
+    """Streaming is opt-in: ?stream=true, ?format=ndjson or Accept: application/x-ndjson."""
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes') or wants_ndjson()
+
+
+def stream_query(query, serialize, batch_size=DEFAULT_BATCH_SIZE):
+    """Stream a query as a JSON array (or NDJSON) without materializing it.
+
+    Rows come from a server-side cursor via yield_per and are encoded and
+    flushed `batch_size` at a time, so memory and time-to-first-byte stay
+    flat no matter how large the table grows.
+    """
+    ndjson = wants_ndjson()
+
+    def generate():
+        if not ndjson:
+            yield b'['
+        first = True
+        batch = []
+        for obj in query.yield_per(batch_size):
+            encoded = dumps(serialize(obj))
+            if ndjson:
+                batch.append(encoded + b'\n')
+            else:
+                batch.append(encoded if first else b',' + encoded)
+                first = False
+            if len(batch) >= batch_size:
+                yield b''.join(batch)
+                batch = []
+        if batch:
+            yield b''.join(batch)
+        if not ndjson:
+            yield b']'
+
+    return Response(stream_with_context(generate()),
+                    mimetype=NDJSON_MIMETYPE if ndjson else 'application/json')
@@ -0,0 +1,112 @@
+from flask import g, request, current_app
+from werkzeug.test import EnvironBuilder
+from werkzeug.exceptions import NotFound, MethodNotAllowed
+from backend.models import db
+from backend.serialization import dumps, JSON_MIMETYPE
+from backend.streaming import wants_stream
+
+MAX_BATCH_REQUESTS = 10
+SUBREQUEST_ENVIRON_KEY = 'backend.subrequest'
+# Headers a sub-request inherits from the batch request
+FORWARDED_HEADERS = ('Authorization', 'Cookie', 'User-Agent')
+# Per-request accounting that is summed into the batch request rather than replaced
+COUNTERS = ('sql_statement_count', 'sql_time', 'serialization_time')
+
+
+def is_subrequest():
+    return request.environ.get(SUBREQUEST_ENVIRON_KEY, False)
+
+
+def _wants_stream(path):
+    # Evaluated as dispatch() will send it, with Accept pinned to JSON
+    with current_app.test_request_context(path, headers={'Accept': JSON_MIMETYPE}):
+        return wants_stream()
+
+
+def parse_batch(data, excluded=()):
+    """Validate {"requests": [{"id": .., "path": "/jobs/?limit=5"}, ...]}; returns [(id, path)].
+
+    Only GETs of ordinary endpoints are allowed: no nesting, no long-lived
+    streams (views marked concurrency_exempt) and no streamed listings
+    (?stream=true, ?format=ndjson), whose bodies would be buffered whole.
+    Raises ValueError.
+    """
+    items = (data or {}).get('requests')
+    if not isinstance(items, list) or not items:
+        raise ValueError("requests must be a non-empty list")
+    if len(items) > MAX_BATCH_REQUESTS:
+        raise ValueError(f"At most {MAX_BATCH_REQUESTS} requests per batch")
+
+    adapter = current_app.url_map.bind('')
+    parsed = []
+    for index, item in enumerate(items):
+        path = item.get('path') if isinstance(item, dict) else item
+        if not isinstance(path, str) or not path.startswith('/'):
+            raise ValueError(f"requests[{index}] needs a path starting with '/'")
+        try:
+            endpoint, _ = adapter.match(path.split('?', 1)[0], method='GET')
+        except (NotFound, MethodNotAllowed):
+            raise ValueError(f"requests[{index}]: no GET endpoint at {path}")
+        view = current_app.view_functions.get(endpoint)
+        if endpoint in excluded or getattr(view, 'concurrency_exempt', False) or _wants_stream(path):
+            raise ValueError(f"requests[{index}]: {path} can't be batched")
+        parsed.append((item.get('id', index) if isinstance(item, dict) else index, path))
+    return parsed
+
+
+def dispatch(path):
+    """Run a GET for `path` inside the current app context; returns (status, mimetype, body bytes).
+
+    Nested request contexts reuse the batch request's app context, so every
+    sub-request shares its DB session and connection. `g` is swapped out
+    for the duration so per-request state (rate-limit slots, replica
+    choice, JWT) can't leak between sub-requests. Streamed responses
+    (exports) fail with 400 without being read.
+    """
+    builder = EnvironBuilder(
+        path=path,
+        method='GET',
+        base_url=request.host_url,
+        headers={
+            **{name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers},
+            'Accept': JSON_MIMETYPE,
+        },
+        environ_base={'REMOTE_ADDR': request.remote_addr, SUBREQUEST_ENVIRON_KEY: True},
+    )
+    saved = dict(vars(g))
+    vars(g).clear()
+    try:
+        with current_app.request_context(builder.get_environ()):
+            try:
+                response = current_app.full_dispatch_request()
+                if response.is_streamed:
+                    response.close()
+                    return 400, JSON_MIMETYPE, dumps({"error": f"{path} streams its response and can't be batched"})
+                body = response.get_data()
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.error(f"Batched request {path} failed: {e}")
+                return 500, JSON_MIMETYPE, dumps({"error": "Internal server error"})
+        return response.status_code, response.mimetype, body
+    finally:
+        counters = {name: g.get(name, 0) for name in COUNTERS}
+        vars(g).clear()
+        vars(g).update(saved)
+        for name, value in counters.items():
+            if value:
+                setattr(g, name, g.get(name, 0) + value)
+
+
+def run_batch(requests):
+    """Run every (id, path) in order; returns the combined JSON body as bytes.
+
+    JSON sub-responses are spliced in as-is instead of being parsed and
+    re-encoded.
+    """
+    parts = []
+    for request_id, path in requests:
+        status, mimetype, body = dispatch(path)
+        if mimetype != JSON_MIMETYPE:
+            body = dumps(body.decode('utf-8', 'replace'))
+        parts.append(b'{"id":%s,"status":%d,"body":%s}' % (dumps(request_id), status, body or b'null'))
+    return b'{"responses":[' + b','.join(parts) + b']}'
@@ -0,0 +1,119 @@
+import json
+import time
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import or_, and_
+from backend.models import db, Task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VISIBILITY_TIMEOUT_SECONDS = 60
+DEFAULT_MAX_ATTEMPTS = 5
+BASE_RETRY_DELAY_SECONDS = 5
+MAX_RETRY_DELAY_SECONDS = 3600
+
+_handlers = {}
+
+
+def task(name):
+    """Register a function as the handler for tasks called `name`."""
+    def decorator(fn):
+        _handlers[name] = fn
+        return fn
+    return decorator
+
+
+def enqueue(name, payload=None, delay_seconds=0, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Add a task to the current session.
+
+    The task is committed together with the caller's own changes, so a
+    posting or application and its follow-up work are stored atomically
+    and the request never waits for the work itself.
+    """
+    new_task = Task(
+        name=name,
+        payload=json.dumps(payload or {}),
+        run_at=datetime.utcnow() + timedelta(seconds=delay_seconds),
+        max_attempts=max_attempts
+    )
+    db.session.add(new_task)
+    return new_task
+
+
+def enqueue_many(name, payloads, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """enqueue() for many payloads as one executemany INSERT (bulk imports)."""
+    if not payloads:
+        return
+    now = datetime.utcnow()
+    db.session.execute(Task.__table__.insert(), [
+        {'name': name, 'payload': json.dumps(payload), 'run_at': now, 'max_attempts': max_attempts}
+        for payload in payloads
+    ])
+
+
+def claim(batch_size=10, visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT_SECONDS, now=None):
+    """Lease up to `batch_size` due tasks to this worker.
+
+    Tasks stay invisible to other workers until their lease expires; a
+    worker that dies mid-task therefore only delays it, never loses it.
+    """
+    now = now or datetime.utcnow()
+    tasks = (
+        Task.query
+        .filter(or_(
+            and_(Task.status == 'queued', Task.run_at <= now),
+            and_(Task.status == 'running', Task.locked_until < now)
+        ))
+        .order_by(Task.run_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for claimed in tasks:
+        claimed.status = 'running'
+        claimed.attempts += 1
+        claimed.locked_until = now + timedelta(seconds=visibility_timeout)
+    db.session.commit()
+    return tasks
+
+
+def _retry_delay(attempts):
+    return min(BASE_RETRY_DELAY_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+
+
+def run_task(claimed):
+    handler = _handlers.get(claimed.name)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for task '{claimed.name}'")
+        handler(**json.loads(claimed.payload))
+        claimed.status = 'done'
+        claimed.locked_until = None
+        db.session.commit()
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Task {claimed.id} ({claimed.name}) failed on attempt {claimed.attempts}")
+        claimed.last_error = str(e)[:500]
+        claimed.locked_until = None
+        if claimed.attempts >= claimed.max_attempts:
+            claimed.status = 'failed'
+        else:
+            claimed.status = 'queued'
+            claimed.run_at = datetime.utcnow() + timedelta(seconds=_retry_delay(claimed.attempts))
+        db.session.commit()
+        return False
+
+
+def work(batch_size=10, poll_interval=1.0, visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT_SECONDS, once=False):
+    """Process tasks until interrupted (or until the queue is drained if `once`)."""
+    processed = 0
+    while True:
+        tasks = claim(batch_size, visibility_timeout)
+        for claimed in tasks:
+            run_task(claimed)
+            processed += 1
+        if not tasks:
+            if once:
+                return processed
+            time.sleep(poll_interval)
@@ -0,0 +1,77 @@
+import pytest
+from backend import refresh_tokens
+from backend.refresh_tokens import MemoryRefreshTokenStore, ROTATED, GRACE, REUSED, REVOKED
+
+TTL = 3600
+GRACE_SECONDS = 10
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(refresh_tokens.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def store(clock):
+    store = MemoryRefreshTokenStore()
+    store.start('fam', 'a', TTL)
+    return store
+
+
+def test_current_token_rotates(store):
+    assert store.rotate('fam', 'a', 'b', TTL, GRACE_SECONDS) == ROTATED
+    assert store.rotate('fam', 'b', 'c', TTL, GRACE_SECONDS) == ROTATED
+
+
+def test_replaced_token_within_grace_keeps_the_family(store, clock):
+    store.rotate('fam', 'a', 'b', TTL, GRACE_SECONDS)
+    clock[0] += GRACE_SECONDS - 1
+    assert store.rotate('fam', 'a', 'x', TTL, GRACE_SECONDS) == GRACE
+    # The grace answer issues no new refresh token; 'b' is still current
+    assert store.rotate('fam', 'b', 'c', TTL, GRACE_SECONDS) == ROTATED
+
+
+def test_replaced_token_after_grace_revokes_the_family(store, clock):
+    store.rotate('fam', 'a', 'b', TTL, GRACE_SECONDS)
+    clock[0] += GRACE_SECONDS
+    assert store.rotate('fam', 'a', 'x', TTL, GRACE_SECONDS) == REUSED
+    assert store.rotate('fam', 'b', 'c', TTL, GRACE_SECONDS) == REVOKED
+
+
+def test_older_token_revokes_the_family(store):
+    store.rotate('fam', 'a', 'b', TTL, GRACE_SECONDS)
+    store.rotate('fam', 'b', 'c', TTL, GRACE_SECONDS)
+    assert store.rotate('fam', 'a', 'x', TTL, GRACE_SECONDS) == REUSED
+    assert store.rotate('fam', 'c', 'd', TTL, GRACE_SECONDS) == REVOKED
+
+
+def test_revoked_family(store):
+    store.revoke('fam')
+    assert store.rotate('fam', 'a', 'b', TTL, GRACE_SECONDS) == REVOKED
+
+
+def test_unknown_family():
+    assert MemoryRefreshTokenStore().rotate('nope', 'a', 'b', TTL, GRACE_SECONDS) == REVOKED
+
+
+def test_family_expires_without_use(store, clock):
+    clock[0] += TTL
+    assert store.rotate('fam', 'a', 'b', TTL, GRACE_SECONDS) == REVOKED
+
+
+def test_rotation_extends_the_family(store, clock):
+    clock[0] += TTL - 1
+    assert store.rotate('fam', 'a', 'b', TTL, GRACE_SECONDS) == ROTATED
+    clock[0] += TTL - 1
+    assert store.rotate('fam', 'b', 'c', TTL, GRACE_SECONDS) == ROTATED
+
+
+def test_prune_drops_only_expired_families(clock):
+    store = MemoryRefreshTokenStore(max_families=1)
+    store.start('old', 'a', 10)
+    clock[0] += 10
+    store.start('new', 'b', TTL)
+    assert store.rotate('new', 'b', 'c', TTL, GRACE_SECONDS) == ROTATED
+    assert 'old' not in store._families
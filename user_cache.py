@@ -0,0 +1,81 @@
+import time
+import threading
+from flask import g, current_app, has_request_context
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from backend.models import db, User
+
+DEFAULT_TTL_SECONDS = 30
+
+_lock = threading.Lock()
+_users = {}
+
+
+def _detached_copy(obj):
+    # Copy only column values into a fresh instance owned by no session, so
+    # the cached snapshot never shares state with a request's session
+    mapper = inspect(obj).mapper
+    copy = mapper.class_()
+    for attribute in mapper.column_attrs:
+        setattr(copy, attribute.key, getattr(obj, attribute.key))
+    return copy
+
+
+def _snapshot(user):
+    snapshot = _detached_copy(user)
+    snapshot.worker = _detached_copy(user.worker) if user.worker else None
+    snapshot.employer = _detached_copy(user.employer) if user.employer else None
+    for obj in (snapshot, snapshot.worker, snapshot.employer):
+        if obj is not None:
+            make_transient_to_detached(obj)
+    return snapshot
+
+
+def _query_user(user_id):
+    return (
+        User.query
+        .options(joinedload(User.worker), joinedload(User.employer))
+        .filter_by(id=user_id)
+        .one_or_none()
+    )
+
+
+def load_user(user_id):
+    """Resolve a user with both profiles, hitting the database at most once.
+
+    Lookups are memoized for the current request and, for USER_CACHE_TTL
+    seconds, across requests in this process. Cached snapshots are merged
+    into the request session without a SELECT, so the returned user can be
+    modified and committed like any loaded instance.
+    """
+    user_id = int(user_id)
+    request_cache = g.setdefault('user_cache', {}) if has_request_context() else {}
+    if user_id in request_cache:
+        return request_cache[user_id]
+
+    ttl = current_app.config.get('USER_CACHE_TTL', DEFAULT_TTL_SECONDS)
+    with _lock:
+        entry = _users.get(user_id)
+    if ttl and entry and entry[0] > time.monotonic():
+        user = db.session.merge(entry[1], load=False)
+    else:
+        user = _query_user(user_id)
+        if user is not None and ttl:
+            with _lock:
+                _users[user_id] = (time.monotonic() + ttl, _snapshot(user))
+
+    request_cache[user_id] = user
+    return user
+
+
+def invalidate_user(user_id):
+    user_id = int(user_id)
+    with _lock:
+        _users.pop(user_id, None)
+    if has_request_context():
+        g.setdefault('user_cache', {}).pop(user_id, None)
+
+
+def clear():
+    with _lock:
+        _users.clear()
@@ -1,7 +1,17 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from flask_cors import cross_origin
-from backend.models import User, Worker, Employer, db
+from backend.models import User, Worker, Employer, Notification, db
+from sqlalchemy.orm import contains_eager, joinedload
+from backend.search_index import search_index
+from backend.response_cache import invalidate
+from backend.user_cache import load_user, invalidate_user
+from backend.streaming import wants_stream, stream_query
+from backend.serialization import user_schema, respond
+from backend.geo import apply_location, address_location
+from backend.task_queue import enqueue
+from backend.rate_limit import rate_limit
+from backend.skills import set_worker_skills
 
 users_bp = Blueprint('users', __name__)
 
@@ -17,8 +27,7 @@ def get_current_user():
         response.headers.add('Access-Control-Allow-Methods', 'GET')
         return response
 
-    user_id = get_jwt_identity()  # Retrieve the user ID from the JWT token
-    user = User.query.get(user_id)  # Query User table for worker or employer
+    user = current_user  # Resolved once per request by user_lookup_callback
 
     if user:
         return jsonify(user.to_dict())  # Replace with the actual method to convert the user to a dictionary
@@ -29,41 +38,71 @@ def get_current_user():
 @users_bp.route('/<int:user_id>', methods=['GET'])
 @jwt_required()
 def get_user(user_id):
-    user = User.query.get(user_id)
+    user = load_user(user_id)
     if user:
         return jsonify(user.to_dict()), 200
     return jsonify({"error": "User not found"}), 404
 
 # ✅ List workers for employers
 @users_bp.route('/workers', methods=['GET'])
+@rate_limit('60/minute')
 @jwt_required()
 def list_workers():
-    user = User.query.get(get_jwt_identity())
-    if not user or user.role != 'employer':
+    # Users have no role column: an employer is a user with an employer profile
+    user = current_user
+    if not user or user.employer is None:
         return jsonify({"error": "Unauthorized"}), 403
+    try:
+        encode = user_schema.encoder(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    workers = User.query.filter_by(role='worker').all()
-    return jsonify([w.to_dict() for w in workers]), 200
+    # Workers are the users with a worker profile, loaded by the same join.
+    # The employer profile is joined too: stream_query's yield_per keeps a
+    # server-side cursor open, which can't run selectinload's extra SELECTs
+    query = (
+        User.query
+        .join(User.worker)
+        .options(contains_eager(User.worker), joinedload(User.employer))
+        .order_by(User.id)
+    )
+    if wants_stream():
+        return stream_query(query, encode)
+    return respond([encode(w) for w in query.all()])
+
+# ✅ Latest notifications for the current user
+@users_bp.route('/notifications', methods=['GET'])
+@jwt_required()
+def list_notifications():
+    limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+    notifications = (
+        Notification.query
+        .filter_by(user_id=get_jwt_identity())
+        .order_by(Notification.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return jsonify([n.to_dict() for n in notifications]), 200
 
 # ✅ Update worker profile
 @users_bp.route('/worker/profile', methods=['GET', 'POST'])
 @jwt_required()
 def worker_profile():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_user  # Already carries its worker profile; no extra queries
     
     if not user:
         return jsonify({"error": "User not found"}), 404
         
     if request.method == 'GET':
-        worker = Worker.query.filter_by(user_id=user_id).first()
+        worker = user.worker
         if worker:
             return jsonify(worker.to_dict()), 200
         return jsonify({"error": "Worker profile not found"}), 404
         
     # Handle POST
     data = request.get_json()
-    worker = Worker.query.filter_by(user_id=user_id).first()
+    worker = user.worker
     
     if not worker:
         worker = Worker(
@@ -81,8 +120,22 @@ def worker_profile():
         worker.years_experience = data.get('experience', worker.years_experience)
         worker.contact_number = data.get('contact_number', worker.contact_number)
         worker.email = data.get('email', worker.email)
-    
+
+    if 'location' in data or worker.city is None:
+        apply_location(worker, data.get('location') or user.location)
+    # A new profile starts from the skills given at registration
+    set_worker_skills(
+        worker,
+        data.get('skills', user.skills if worker.id is None else None),
+        data.get('preferred_job_titles')
+    )
+
+    db.session.flush()
+    enqueue('update_worker_matches', {'worker_id': worker.id})
     db.session.commit()
+    search_index.index('worker', worker)
+    invalidate('workers', f'worker:{user_id}')
+    invalidate_user(user_id)
     return jsonify(worker.to_dict()), 200
 
 # ✅ Update employer profile
@@ -90,20 +143,20 @@ def worker_profile():
 @jwt_required()
 def employer_profile():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_user  # Already carries its employer profile; no extra queries
     
     if not user:
         return jsonify({"error": "User not found"}), 404
         
     if request.method == 'GET':
-        employer = Employer.query.filter_by(user_id=user_id).first()
+        employer = user.employer
         if employer:
             return jsonify(employer.to_dict()), 200
         return jsonify({"error": "Employer profile not found"}), 404
         
     # Handle POST
     data = request.get_json()
-    employer = Employer.query.filter_by(user_id=user_id).first()
+    employer = user.employer
     
     if not employer:
         employer = Employer(
@@ -121,6 +174,12 @@ def employer_profile():
         employer.address = data.get('address', employer.address)
         employer.contact_number = data.get('contact_number', employer.contact_number)
         employer.email = data.get('email', employer.email)
+
+    if 'address' in data or employer.city is None:
+        apply_location(employer, address_location(employer.address))
     
     db.session.commit()
+    search_index.index('employer', employer)
+    invalidate('employers')
+    invalidate_user(user_id)
     return jsonify(employer.to_dict()), 200
@@ -0,0 +1,9 @@
+# Production entry point:
+#
+#   gunicorn -c backend/gunicorn.conf.py backend.wsgi:app
+#
+# Schema creation is not part of startup; run `flask --app backend.app init-db`
+# (or `flask db upgrade`) once per deploy before starting the workers.
+from .app import create_app
+
+app = create_app()